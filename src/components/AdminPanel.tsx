@@ -9,7 +9,12 @@ import {
   deleteDoc, 
   addDoc, 
   getDoc,
-  orderBy 
+  orderBy,
+  getCountFromServer,
+  getAggregateFromServer,
+  count,
+  sum,
+  runTransaction
 } from 'firebase/firestore'
 import { useFirebase } from '../contexts/FirebaseContext'
 import { useTelegram } from '../contexts/TelegramContext'
@@ -36,8 +41,33 @@ import CRMPanel from './crm/CRMPanel'
 import CustomerManagement from './admin/CustomerManagement'
 import { InventoryManager } from './admin/InventoryManager'
 import { shopLinkUtils } from '../utils/shopLinks'
+import { getDocsByIds } from '../utils/firestoreQueries'
 import { shopCustomerService } from '../services/shopCustomerService'
 
+type AdminTab = 'products' | 'categories' | 'departments' | 'analytics' | 'profile' | 'orders' | 'crm' | 'customers' | 'inventory' | 'settings'
+
+interface AdminNavTab {
+  id: AdminTab
+  label: string
+  icon: React.ComponentType<{ className?: string }>
+}
+
+// Bottom navigation is static, so build the tab lists once instead of per render
+const PRIMARY_NAV_TABS: AdminNavTab[] = [
+  { id: 'products', label: 'Products', icon: Package },
+  { id: 'inventory', label: 'Inventory', icon: QrCode },
+  { id: 'orders', label: 'Orders', icon: ShoppingCart },
+  { id: 'customers', label: 'Customers', icon: User },
+  { id: 'crm', label: 'CRM', icon: MessageCircle },
+]
+
+const SECONDARY_NAV_TABS: AdminNavTab[] = [
+  { id: 'categories', label: 'Categories', icon: Tag },
+  { id: 'departments', label: 'Departments', icon: Users },
+  { id: 'analytics', label: 'Analytics', icon: BarChart3 },
+  { id: 'settings', label: 'Settings', icon: Settings },
+]
+
 const AdminPanel: React.FC = () => {
   const { db } = useFirebase()
   const { user, startParam } = useTelegram()
@@ -49,7 +79,7 @@ const AdminPanel: React.FC = () => {
   const [products, setProducts] = useState<Product[]>([])
   const [categories, setCategories] = useState<Category[]>([])
   const [departments, setDepartments] = useState<Department[]>([])
-  const [activeTab, setActiveTab] = useState<'products' | 'categories' | 'departments' | 'analytics' | 'profile' | 'orders' | 'crm' | 'customers' | 'inventory' | 'settings'>('profile')
+  const [activeTab, setActiveTab] = useState<AdminTab>('profile')
   const [editingShop, setEditingShop] = useState<Shop | null>(null)
   const [editingProduct, setEditingProduct] = useState<Product | null>(null)
   const [editingCategory, setEditingCategory] = useState<Category | null>(null)
@@ -99,7 +129,17 @@ const AdminPanel: React.FC = () => {
       )
 
       if (result.success && result.shopId) {
-        await loadUserData()
+        const adminShops = await loadUserData()
+
+        // loadUserData already resolved the shops this user administers, so a
+        // linked shop among them needs no further role or shop lookups
+        const adminShop = adminShops.find(shop => shop.id === result.shopId)
+        if (adminShop) {
+          setSelectedShop(adminShop)
+          setActiveTab('products')
+          await fetchShopData(adminShop.id)
+          return
+        }
 
         const shopCustomersRef = collection(db, 'shop_customers')
         const roleQuery = query(
@@ -155,25 +195,38 @@ const AdminPanel: React.FC = () => {
     }
   }
 
-  const loadUserData = async () => {
+  const loadUserData = async (): Promise<Shop[]> => {
     try {
       setLoading(true)
       setError(null)
 
       if (!user?.id) {
         setError('No user information available')
-        return
+        return []
       }
 
-      // Get user document from Firebase using Telegram ID
+      // The user document and the admin memberships are both keyed by Telegram ID,
+      // so fetch them together
       const usersRef = collection(db, 'users')
       const userQuery = query(usersRef, where('telegramId', '==', parseInt(user.id)))
-      const userSnapshot = await getDocs(userQuery)
+
+      // Get shops where user has admin role in shop_customers
+      const shopCustomersRef = collection(db, 'shop_customers')
+      const adminQuery = query(
+        shopCustomersRef,
+        where('telegramId', '==', parseInt(user.id)),
+        where('role', '==', 'admin')
+      )
+
+      const [userSnapshot, adminShopsSnapshot] = await Promise.all([
+        getDocs(userQuery),
+        getDocs(adminQuery)
+      ])
 
       if (userSnapshot.empty) {
         setError('User not found in database')
         setLoading(false)
-        return
+        return []
       }
 
       const userDoc = userSnapshot.docs[0]
@@ -184,30 +237,22 @@ const AdminPanel: React.FC = () => {
       // Also load bot token
       setBotToken(userData.telegramBotToken || '')
 
-      // Get shops where user has admin role in shop_customers
-      const shopCustomersRef = collection(db, 'shop_customers')
-      const adminQuery = query(
-        shopCustomersRef,
-        where('telegramId', '==', parseInt(user.id)),
-        where('role', '==', 'admin')
-      )
-      const adminShopsSnapshot = await getDocs(adminQuery)
-      const adminShopIds = adminShopsSnapshot.docs.map(doc => doc.data().shopId)
+      const adminShopIds = Array.from(new Set(adminShopsSnapshot.docs.map(doc => doc.data().shopId as string)))
 
       if (adminShopIds.length === 0) {
         setOwnedShops([])
         setLoading(false)
-        return
+        return []
       }
 
-      const shopsRef = collection(db, 'shops')
-      const ownerQuery = query(shopsRef, where('isActive', '==', true))
-      const shopsSnapshot = await getDocs(ownerQuery)
+      // Load only the shops this user administers, in 'in' query batches,
+      // rather than scanning every active shop and filtering client-side
+      const shopDocs = await getDocsByIds(db, 'shops', adminShopIds)
  
       const shopsList: Shop[] = []
-      shopsSnapshot.forEach((doc) => {
-        if (adminShopIds.includes(doc.id)) {
-          const data = doc.data()
+      shopDocs.forEach((doc) => {
+        const data = doc.data()
+        if (data.isActive === true) {
           const shop: Shop = {
             id: doc.id,
             ownerId: data.ownerId,
@@ -232,10 +277,11 @@ const AdminPanel: React.FC = () => {
       })
 
       setOwnedShops(shopsList)
-      
+      return shopsList
     } catch (error) {
       console.error('Error loading user data:', error)
       setError('Failed to load user data. Please try again.')
+      return []
     } finally {
       setLoading(false)
     }
@@ -259,8 +305,7 @@ const AdminPanel: React.FC = () => {
       )
       const productsSnapshot = await getDocs(productsQuery)
       
-      const productsList: Product[] = []
-      productsSnapshot.forEach((doc) => {
+      const productsList: Product[] = productsSnapshot.docs.map((doc) => {
         const data = doc.data()
         const product: Product = {
           id: doc.id,
@@ -283,7 +328,7 @@ const AdminPanel: React.FC = () => {
           createdAt: data.createdAt?.toDate() || new Date(),
           updatedAt: data.updatedAt?.toDate() || new Date()
         }
-        productsList.push(product)
+        return product
       })
 
       setProducts(productsList)
@@ -303,8 +348,7 @@ const AdminPanel: React.FC = () => {
       )
       const categoriesSnapshot = await getDocs(categoriesQuery)
       
-      const categoriesList: Category[] = []
-      categoriesSnapshot.forEach((doc) => {
+      const categoriesList: Category[] = categoriesSnapshot.docs.map((doc) => {
         const data = doc.data()
         const category: Category = {
           id: doc.id,
@@ -320,7 +364,7 @@ const AdminPanel: React.FC = () => {
           createdAt: data.createdAt?.toDate() || new Date(),
           updatedAt: data.updatedAt?.toDate() || new Date()
         }
-        categoriesList.push(category)
+        return category
       })
 
       setCategories(categoriesList)
@@ -375,35 +419,23 @@ const AdminPanel: React.FC = () => {
 
   const updateShopStats = async (shopId: string) => {
     try {
-      // Get product count
-      const productsRef = collection(db, 'products')
-      const productsQuery = query(productsRef, where('shopId', '==', shopId), where('isActive', '==', true))
-      const productsSnapshot = await getDocs(productsQuery)
-      const totalProducts = productsSnapshot.size
-
-      // Get order stats
-      const ordersRef = collection(db, 'orders')
-      const ordersQuery = query(ordersRef, where('shopId', '==', shopId))
-      const ordersSnapshot = await getDocs(ordersQuery)
-
-      let totalOrders = 0
-      let totalRevenue = 0
-      const customerIds = new Set<string>()
-
-      ordersSnapshot.forEach((doc) => {
-        const data = doc.data()
-        totalOrders++
-        totalRevenue += data.total || 0
-        if (data.customerId) {
-          customerIds.add(data.customerId)
-        }
-      })
-
-      // Get unique customers count from shop_customers
-      const shopCustomersRef = collection(db, 'shop_customers')
-      const customersQuery = query(shopCustomersRef, where('shopId', '==', shopId))
-      const customersSnapshot = await getDocs(customersQuery)
-      const totalCustomers = customersSnapshot.size
+      // Let Firestore aggregate server-side instead of downloading every document to count it
+      const productsQuery = query(collection(db, 'products'), where('shopId', '==', shopId), where('isActive', '==', true))
+      const ordersQuery = query(collection(db, 'orders'), where('shopId', '==', shopId))
+      const customersQuery = query(collection(db, 'shop_customers'), where('shopId', '==', shopId))
+
+      const [productsCount, orderTotals, customersCount] = await Promise.all([
+        getCountFromServer(productsQuery),
+        getAggregateFromServer(ordersQuery, {
+          totalOrders: count(),
+          totalRevenue: sum('total')
+        }),
+        getCountFromServer(customersQuery)
+      ])
+
+      const totalProducts = productsCount.data().count
+      const { totalOrders, totalRevenue } = orderTotals.data()
+      const totalCustomers = customersCount.data().count
 
       const shopStats = {
         totalProducts,
@@ -457,18 +489,21 @@ const AdminPanel: React.FC = () => {
       } else {
         // Add new product
         const productsRef = collection(db, 'products')
+        const now = new Date()
         await addDoc(productsRef, {
           ...productData,
-          createdAt: new Date(),
-          updatedAt: new Date()
+          createdAt: now,
+          updatedAt: now
         })
       }
 
       setEditingProduct(null)
       setShowAddProduct(false)
       if (selectedShop) {
-        await fetchShopProducts(selectedShop.id)
-        await updateShopStats(selectedShop.id)
+        await Promise.all([
+          fetchShopProducts(selectedShop.id),
+          updateShopStats(selectedShop.id)
+        ])
       }
     } catch (error) {
       console.error('Error saving product:', error)
@@ -483,8 +518,10 @@ const AdminPanel: React.FC = () => {
       await deleteDoc(productRef)
 
       if (selectedShop) {
-        await fetchShopProducts(selectedShop.id)
-        await updateShopStats(selectedShop.id)
+        await Promise.all([
+          fetchShopProducts(selectedShop.id),
+          updateShopStats(selectedShop.id)
+        ])
       }
     } catch (error) {
       console.error('Error deleting product:', error)
@@ -511,20 +548,30 @@ const AdminPanel: React.FC = () => {
         })
         success('Category updated successfully!')
       } else {
-        // Add new category
-        const categoriesRef = collection(db, 'categories')
-        await addDoc(categoriesRef, {
-          userId: categoryData.userId,
-          shopId: categoryData.shopId,
-          name: categoryData.name,
-          description: categoryData.description || '',
-          icon: categoryData.icon,
-          color: categoryData.color || '#3b82f6',
-          order: categoryData.order ?? 0,
-          isActive: categoryData.isActive !== false,
-          productCount: 0,
-          createdAt: new Date(),
-          updatedAt: new Date()
+        // Add new category, taking the next display order from the shop's category
+        // counter inside a transaction so concurrent creates can't share a slot
+        const now = new Date()
+        const shopRef = doc(db, 'shops', categoryData.shopId)
+        const categoryRef = doc(collection(db, 'categories'))
+        await runTransaction(db, async (transaction) => {
+          const shopDoc = await transaction.get(shopRef)
+          const storedCount = shopDoc.data()?.categoryCount
+          const order = typeof storedCount === 'number' ? storedCount : categories.length
+
+          transaction.update(shopRef, { categoryCount: order + 1 })
+          transaction.set(categoryRef, {
+            userId: categoryData.userId,
+            shopId: categoryData.shopId,
+            name: categoryData.name,
+            description: categoryData.description || '',
+            icon: categoryData.icon,
+            color: categoryData.color || '#3b82f6',
+            order,
+            isActive: categoryData.isActive !== false,
+            productCount: 0,
+            createdAt: now,
+            updatedAt: now
+          })
         })
         success('Category created successfully!')
       }
@@ -571,10 +618,11 @@ const AdminPanel: React.FC = () => {
       } else {
         // Add new department
         const departmentsRef = collection(db, 'departments')
+        const now = new Date()
         await addDoc(departmentsRef, {
           ...departmentData,
-          createdAt: new Date(),
-          updatedAt: new Date()
+          createdAt: now,
+          updatedAt: now
         })
       }
       
@@ -611,6 +659,7 @@ const AdminPanel: React.FC = () => {
       // Delete the shop document
       const shopRef = doc(db, 'shops', shopId)
       await deleteDoc(shopRef)
+      shopCustomerService.invalidateShopOwnership(shopId)
       
       // If this was the selected shop, clear selection
       if (selectedShop?.id === shopId) {
@@ -710,32 +759,18 @@ const AdminPanel: React.FC = () => {
         selectedDepartments 
       } = promotionData
 
-      // Generate promotion message
-      const discountText = discountPercentage > 0 ? `\n💥 <b>${discountPercentage}% OFF!</b>` : ''
-      const originalPrice = discountPercentage > 0 ? `\n~~$${product.price.toFixed(2)}~~ ` : ''
-      const discountedPrice = discountPercentage > 0 ? `<b>$${(product.price * (1 - discountPercentage / 100)).toFixed(2)}</b>` : `<b>$${product.price.toFixed(2)}</b>`
-      const validUntilText = validUntil ? `\n⏰ <b>Valid until:</b> ${validUntil.toLocaleDateString()}` : ''
-      const tagsText = tags.length > 0 ? `\n\n${tags.join(' ')}` : ''
-
       const botUsername = import.meta.env.VITE_TELEGRAM_BOT_USERNAME || 'shop_test3_bot'
       const productLink = shopLinkUtils.generateShopLink(product.shopId, { productId: product.id, botUsername })
 
-      const message = `
-🔥 <b>${promotionTitle}</b>${discountText}
-
-🛍️ <b>${product.name}</b>
-
-${customMessage || product.description}
-
-💰 <b>Price:</b> ${originalPrice}${discountedPrice}
-${product.sku ? `🏷️ <b>SKU:</b> ${product.sku}` : ''}${validUntilText}
-
-🛒 <b>Order Now!</b> Don't miss this amazing deal!${tagsText}
-
-👉 <a href="${productLink}">View Product</a>
-
-<i>🚀 Limited time offer - Order today!</i>
-      `.trim()
+      // Generate promotion message
+      const message = shopLinkUtils.generatePromotionMessage(product, {
+        promotionTitle,
+        customMessage,
+        discountPercentage,
+        validUntil,
+        tags,
+        botUsername
+      })
 
       const promotionMessage = {
         text: message,
@@ -1290,6 +1325,7 @@ ${product.sku ? `🏷️ <b>SKU:</b> ${product.sku}` : ''}${validUntilText}
                 ...updatedShop,
                 updatedAt: new Date()
               })
+              shopCustomerService.invalidateShopOwnership(updatedShop.id)
               setEditingShop(null)
               await loadUserData()
             } catch (error) {
@@ -1322,11 +1358,12 @@ ${product.sku ? `🏷️ <b>SKU:</b> ${product.sku}` : ''}${validUntilText}
           onSave={async (shopData) => {
             try {
               setError(null)
+              const now = new Date()
               const shopsRef = collection(db, 'shops')
               const shopDoc = await addDoc(shopsRef, {
                 ...shopData,
-                createdAt: new Date(),
-                updatedAt: new Date()
+                createdAt: now,
+                updatedAt: now
               })
 
               const shopCustomersRef = collection(db, 'shop_customers')
@@ -1335,8 +1372,8 @@ ${product.sku ? `🏷️ <b>SKU:</b> ${product.sku}` : ''}${validUntilText}
                 telegramId: userData.telegramId || userData.telegram_id,
                 shopId: shopDoc.id,
                 role: 'admin',
-                createdAt: new Date(),
-                updatedAt: new Date()
+                createdAt: now,
+                updatedAt: now
               })
 
               setShowCreateShop(false)
@@ -1397,16 +1434,10 @@ ${product.sku ? `🏷️ <b>SKU:</b> ${product.sku}` : ''}${validUntilText}
       {selectedShop && (
         <div className="fixed bottom-0 left-0 right-0 bg-telegram-bg border-t border-telegram-hint/10 safe-area-inset-bottom z-20">
           <div className="grid grid-cols-5 gap-1 p-2">
-            {[
-              { id: 'products', label: 'Products', icon: Package },
-              { id: 'inventory', label: 'Inventory', icon: QrCode },
-              { id: 'orders', label: 'Orders', icon: ShoppingCart },
-              { id: 'customers', label: 'Customers', icon: User },
-              { id: 'crm', label: 'CRM', icon: MessageCircle },
-            ].map((tab) => (
+            {PRIMARY_NAV_TABS.map((tab) => (
               <button
                 key={tab.id}
-                onClick={() => setActiveTab(tab.id as any)}
+                onClick={() => setActiveTab(tab.id)}
                 className={`flex flex-col items-center gap-1 py-2 px-1 rounded-xl transition-all active:scale-95 ${
                   activeTab === tab.id
                     ? 'bg-telegram-button/10 text-telegram-button'
@@ -1419,15 +1450,10 @@ ${product.sku ? `🏷️ <b>SKU:</b> ${product.sku}` : ''}${validUntilText}
             ))}
           </div>
           <div className="grid grid-cols-4 gap-1 px-2 pb-2">
-            {[
-              { id: 'categories', label: 'Categories', icon: Tag },
-              { id: 'departments', label: 'Departments', icon: Users },
-              { id: 'analytics', label: 'Analytics', icon: BarChart3 },
-              { id: 'settings', label: 'Settings', icon: Settings },
-            ].map((tab) => (
+            {SECONDARY_NAV_TABS.map((tab) => (
               <button
                 key={tab.id}
-                onClick={() => setActiveTab(tab.id as any)}
+                onClick={() => setActiveTab(tab.id)}
                 className={`flex flex-col items-center gap-1 py-2 px-1 rounded-xl transition-all active:scale-95 ${
                   activeTab === tab.id
                     ? 'bg-telegram-button/10 text-telegram-button'
@@ -1,11 +1,17 @@
-import React, { useEffect, useState } from 'react'
-import { collection, getDocs, query, where, orderBy, doc, getDoc, addDoc } from 'firebase/firestore'
+import React, { useEffect, useMemo, useState } from 'react'
+import { collection, getDocs, query, where, orderBy, doc, getDoc, runTransaction } from 'firebase/firestore'
 import { useFirebase } from '../contexts/FirebaseContext'
 import { useTelegram } from '../contexts/TelegramContext'
 import { Shop, Product, UserData, Order, OrderItem, Category } from '../types'
 import { Store, Star, Package, ArrowLeft, ShoppingCart, Plus, Minus, CheckCircle, Trash2, X } from 'lucide-react'
 import ProductDetails from './ProductDetails'
 import { shopCustomerService } from '../services/shopCustomerService'
+import { getDocsByIds } from '../utils/firestoreQueries'
+
+// Switching between shops or reopening one re-requested the whole catalog; a
+// short TTL keeps browsing snappy while still picking up admin edits quickly
+const CATALOG_TTL_MS = 30 * 1000
+const catalogCache = new Map<string, { categories: Category[]; products: Product[]; expiresAt: number }>()
 
 const ShopList: React.FC = () => {
   const { db } = useFirebase()
@@ -23,6 +29,7 @@ const ShopList: React.FC = () => {
   const [cart, setCart] = useState<OrderItem[]>([])
   const [orderPlacing, setOrderPlacing] = useState(false)
   const [showOrderSuccess, setShowOrderSuccess] = useState(false)
+  const [cartMessage, setCartMessage] = useState<string | null>(null)
   const [linkProcessed, setLinkProcessed] = useState(false)
   const [deletingShopId, setDeletingShopId] = useState<string | null>(null)
   const [showDeleteConfirm, setShowDeleteConfirm] = useState(false)
@@ -169,34 +176,32 @@ const ShopList: React.FC = () => {
         return
       }
 
-      const shopIds = customerSnapshot.docs.map(doc => doc.data().shopId)
+      const shopIds = Array.from(new Set(customerSnapshot.docs.map(doc => doc.data().shopId as string)))
 
-      const allShops: Shop[] = []
-      for (const shopId of shopIds) {
-        const shopRef = doc(db, 'shops', shopId)
-        const shopDoc = await getDoc(shopRef)
+      // Fetch shops in 'in' query batches instead of one getDoc round-trip per shop
+      const shopDocs = await getDocsByIds(db, 'shops', shopIds)
 
-        if (shopDoc.exists()) {
-          const data = shopDoc.data()
-          if (data.isActive) {
-            const shop: Shop = {
-              id: shopDoc.id,
-              ownerId: data.ownerId,
-              name: data.name,
-              slug: data.slug,
-              description: data.description,
-              logo: data.logo,
-              isActive: data.isActive,
-              businessInfo: data.businessInfo,
-              settings: data.settings,
-              stats: data.stats,
-              createdAt: data.createdAt?.toDate() || new Date(),
-              updatedAt: data.updatedAt?.toDate() || new Date()
-            }
-            allShops.push(shop)
+      const allShops: Shop[] = []
+      shopDocs.forEach(shopDoc => {
+        const data = shopDoc.data()
+        if (data.isActive) {
+          const shop: Shop = {
+            id: shopDoc.id,
+            ownerId: data.ownerId,
+            name: data.name,
+            slug: data.slug,
+            description: data.description,
+            logo: data.logo,
+            isActive: data.isActive,
+            businessInfo: data.businessInfo,
+            settings: data.settings,
+            stats: data.stats,
+            createdAt: data.createdAt?.toDate() || new Date(),
+            updatedAt: data.updatedAt?.toDate() || new Date()
           }
+          allShops.push(shop)
         }
-      }
+      })
 
       allShops.sort((a, b) => b.updatedAt.getTime() - a.updatedAt.getTime())
 
@@ -214,11 +219,20 @@ const ShopList: React.FC = () => {
 
 
   const fetchShopData = async (shopId: string) => {
+    const cached = catalogCache.get(shopId)
+    if (cached && cached.expiresAt > Date.now()) {
+      setCategories(cached.categories)
+      setProducts(cached.products)
+      setError(null)
+      setLoading(false)
+      return
+    }
+
     try {
       setLoading(true)
       setError(null)
 
-      // Load categories
+      // Categories and products are independent, so fetch them concurrently
       const categoriesRef = collection(db, 'categories')
       const categoriesQuery = query(
         categoriesRef,
@@ -226,12 +240,21 @@ const ShopList: React.FC = () => {
         where('isActive', '==', true),
         orderBy('order', 'asc')
       )
-      const categoriesSnapshot = await getDocs(categoriesQuery)
+      const productsRef = collection(db, 'products')
+      const productsQuery = query(
+        productsRef,
+        where('shopId', '==', shopId),
+        where('isActive', '==', true),
+        orderBy('name', 'asc')
+      )
+      const [categoriesSnapshot, productsSnapshot] = await Promise.all([
+        getDocs(categoriesQuery),
+        getDocs(productsQuery)
+      ])
 
-      const categoriesList: Category[] = []
-      categoriesSnapshot.forEach((doc) => {
+      const categoriesList: Category[] = categoriesSnapshot.docs.map((doc) => {
         const data = doc.data()
-        categoriesList.push({
+        return {
           id: doc.id,
           userId: data.userId,
           shopId: data.shopId,
@@ -245,28 +268,20 @@ const ShopList: React.FC = () => {
           productCount: data.productCount || 0,
           createdAt: data.createdAt?.toDate() || new Date(),
           updatedAt: data.updatedAt?.toDate() || new Date()
-        })
+        }
       })
 
       setCategories(categoriesList)
 
-      // Load all products
-      const productsRef = collection(db, 'products')
-      const productsQuery = query(
-        productsRef,
-        where('shopId', '==', shopId),
-        where('isActive', '==', true),
-        orderBy('name', 'asc')
-      )
-      const productsSnapshot = await getDocs(productsQuery)
-
-      const productsList: Product[] = []
-      productsSnapshot.forEach((doc) => {
-        const data = doc.data()
-        productsList.push(createProductFromData(doc.id, data))
-      })
+      const productsList: Product[] = productsSnapshot.docs.map((doc) => createProductFromData(doc.id, doc.data()))
 
       setProducts(productsList)
+
+      catalogCache.set(shopId, {
+        categories: categoriesList,
+        products: productsList,
+        expiresAt: Date.now() + CATALOG_TTL_MS
+      })
     } catch (error) {
       console.error('Error fetching shop data:', error)
       setError('Failed to load shop catalog. Please try again.')
@@ -275,9 +290,24 @@ const ShopList: React.FC = () => {
     }
   }
 
+  // Group products by category once per load so the category chips and the
+  // product grid read from the index instead of rescanning every product
+  const productsByCategory = useMemo(() => {
+    const index = new Map<string, Product[]>()
+    for (const product of products) {
+      const group = index.get(product.category)
+      if (group) {
+        group.push(product)
+      } else {
+        index.set(product.category, [product])
+      }
+    }
+    return index
+  }, [products])
+
   const filteredProducts = selectedCategory === 'all'
     ? products
-    : products.filter(product => product.category === selectedCategory)
+    : productsByCategory.get(selectedCategory) || []
 
 
   const createProductFromData = (id: string, data: any): Product => {
@@ -321,15 +351,16 @@ const ShopList: React.FC = () => {
     setError(null)
   }
 
+  // Functional updates so rapid taps each apply to the latest cart rather than a stale render's copy
   const addToCart = (product: Product) => {
-    const existingItem = cart.find(item => item.productId === product.id)
-    if (existingItem) {
-      setCart(cart.map(item => 
-        item.productId === product.id 
-          ? { ...item, quantity: item.quantity + 1, total: (item.quantity + 1) * item.price }
-          : item
-      ))
-    } else {
+    setCart(prev => {
+      if (prev.some(item => item.productId === product.id)) {
+        return prev.map(item =>
+          item.productId === product.id
+            ? { ...item, quantity: item.quantity + 1, total: (item.quantity + 1) * item.price }
+            : item
+        )
+      }
       const newItem: OrderItem = {
         productId: product.id,
         productName: product.name,
@@ -339,15 +370,15 @@ const ShopList: React.FC = () => {
         productImage: product.images?.[0],
         productSku: product.sku
       }
-      setCart([...cart, newItem])
-    }
+      return [...prev, newItem]
+    })
   }
 
   const updateCartQuantity = (productId: string, quantity: number) => {
     if (quantity <= 0) {
-      setCart(cart.filter(item => item.productId !== productId))
+      setCart(prev => prev.filter(item => item.productId !== productId))
     } else {
-      setCart(cart.map(item => 
+      setCart(prev => prev.map(item => 
         item.productId === productId 
           ? { ...item, quantity, total: quantity * item.price }
           : item
@@ -373,12 +404,14 @@ const ShopList: React.FC = () => {
     try {
       setOrderPlacing(true)
       setError(null)
+      setCartMessage(null)
 
       const subtotal = getCartTotal()
       const tax = subtotal * 0.1
       const total = subtotal + tax
 
       const telegramIdNum = parseInt(user.id)
+      const now = new Date()
 
       const orderData = {
         shopId: selectedShop.id,
@@ -394,12 +427,48 @@ const ShopList: React.FC = () => {
         source: 'web',
         telegramId: telegramIdNum,
         telegramUsername: user.username || '',
-        createdAt: new Date(),
-        updatedAt: new Date()
+        createdAt: now,
+        updatedAt: now
       }
 
-      const ordersRef = collection(db, 'orders')
-      await addDoc(ordersRef, orderData)
+      // Re-check stock and reserve it atomically with the order write so two
+      // customers can't both buy the last unit
+      const orderRef = doc(collection(db, 'orders'))
+      const unavailableItems = await runTransaction(db, async (transaction) => {
+        const productRefs = cart.map(item => doc(db, 'products', item.productId))
+        const productDocs = await Promise.all(productRefs.map(ref => transaction.get(ref)))
+
+        const unavailable = cart
+          .filter((item, index) => {
+            const productDoc = productDocs[index]
+            return !productDoc.exists() || (productDoc.data().stock || 0) < item.quantity
+          })
+          .map(item => item.productName)
+
+        if (unavailable.length > 0) {
+          return unavailable
+        }
+
+        cart.forEach((item, index) => {
+          transaction.update(productRefs[index], {
+            stock: (productDocs[index].data()?.stock || 0) - item.quantity,
+            updatedAt: now
+          })
+        })
+        transaction.set(orderRef, orderData)
+        return []
+      })
+
+      // Stock just changed (or turned out to be stale), so don't serve this shop's cached catalog
+      catalogCache.delete(selectedShop.id)
+
+      if (unavailableItems.length > 0) {
+        // A shortage is an expected outcome, so report it in the cart and reload
+        // the catalog so the stock shown is current
+        setCartMessage(`Not enough stock for: ${unavailableItems.join(', ')}`)
+        await fetchShopData(selectedShop.id)
+        return
+      }
 
       setCart([])
       setShowOrderSuccess(true)
@@ -418,11 +487,13 @@ const ShopList: React.FC = () => {
   const handleViewCart = () => {
     setCurrentView('cart')
     setError(null)
+    setCartMessage(null)
   }
 
   const handleBackToProducts = () => {
     setCurrentView('products')
     setError(null)
+    setCartMessage(null)
   }
 
   const handleDeleteClick = (e: React.MouseEvent, shop: Shop) => {
@@ -789,6 +860,13 @@ const ShopList: React.FC = () => {
           </div>
         )}
 
+        {cartMessage && (
+          <div className="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded-lg flex items-center space-x-2 mb-4">
+            <X className="w-5 h-5 flex-shrink-0" />
+            <span className="text-sm">{cartMessage}</span>
+          </div>
+        )}
+
         {cart.length === 0 ? (
           <div className="text-center py-12">
             <ShoppingCart className="w-16 h-16 mx-auto text-telegram-hint mb-4" />
@@ -926,7 +1004,7 @@ const ShopList: React.FC = () => {
               >
                 <span>{category.icon}</span>
                 <span>{category.name}</span>
-                <span className="text-xs opacity-70">({products.filter(p => p.category === category.name).length})</span>
+                <span className="text-xs opacity-70">({productsByCategory.get(category.name)?.length || 0})</span>
               </button>
             ))}
           </div>
@@ -252,55 +252,58 @@ const UserProfile: React.FC<UserProfileProps> = ({ user, userData: propUserData
       setError(null)
 
       const ordersRef = collection(db, 'orders')
-      const allOrdersSnapshot = await getDocs(ordersRef)
+      const telegramIdNum = parseInt(user.id)
+      const telegramIdValues: (string | number)[] = isNaN(telegramIdNum) ? [user.id] : [user.id, telegramIdNum]
+
+      // Let Firestore filter by owner instead of downloading every order; an order
+      // can match both queries, so results are merged by document id
+      const [telegramSnapshot, customerSnapshot] = await Promise.all([
+        getDocs(query(ordersRef, where('telegramId', 'in', telegramIdValues))),
+        getDocs(query(ordersRef, where('customerId', '==', user.id)))
+      ])
 
       const userOrders: Order[] = []
-      const telegramIdNum = parseInt(user.id)
+      const seenOrderIds = new Set<string>()
+      const matchingDocs = [...telegramSnapshot.docs, ...customerSnapshot.docs]
 
-      allOrdersSnapshot.forEach((doc) => {
-        const data = doc.data()
+      matchingDocs.forEach((doc) => {
+        if (seenOrderIds.has(doc.id)) return
+        seenOrderIds.add(doc.id)
 
-        const matchesTelegramId =
-          data.telegramId === user.id ||
-          data.telegramId === telegramIdNum ||
-          data.customerId === user.id ||
-          data.customerId === user.id.toString()
-
-        if (matchesTelegramId) {
-          const order: Order = {
-            id: doc.id,
-            shopId: data.shopId || '',
-            customerId: data.customerId || '',
-            customerName: data.customerName || 'Unknown Customer',
-            customerPhone: data.customerPhone,
-            customerEmail: data.customerEmail,
-            items: data.items || [],
-            subtotal: data.subtotal || 0,
-            tax: data.tax || 0,
-            total: data.total || 0,
-            status: data.status || 'pending',
-            paymentStatus: data.paymentStatus || 'pending',
-            deliveryMethod: data.deliveryMethod || 'pickup',
-            deliveryAddress: data.deliveryAddress,
-            deliveryFee: data.deliveryFee,
-            estimatedDeliveryTime: data.estimatedDeliveryTime?.toDate(),
-            paymentPreference: data.paymentPreference,
-            paymentPhotoUrl: data.paymentPhotoUrl,
-            requiresPaymentConfirmation: data.requiresPaymentConfirmation,
-            customerNotes: data.customerNotes,
-            source: data.source || 'web',
-            tableNumber: data.tableNumber,
-            telegramId: data.telegramId,
-            telegramUsername: data.telegramUsername,
-            trackingNumber: data.trackingNumber,
-            createdAt: data.createdAt?.toDate() || new Date(),
-            updatedAt: data.updatedAt?.toDate() || new Date(),
-            confirmedAt: data.confirmedAt?.toDate(),
-            shippedAt: data.shippedAt?.toDate(),
-            deliveredAt: data.deliveredAt?.toDate()
-          }
-          userOrders.push(order)
+        const data = doc.data()
+        const order: Order = {
+          id: doc.id,
+          shopId: data.shopId || '',
+          customerId: data.customerId || '',
+          customerName: data.customerName || 'Unknown Customer',
+          customerPhone: data.customerPhone,
+          customerEmail: data.customerEmail,
+          items: data.items || [],
+          subtotal: data.subtotal || 0,
+          tax: data.tax || 0,
+          total: data.total || 0,
+          status: data.status || 'pending',
+          paymentStatus: data.paymentStatus || 'pending',
+          deliveryMethod: data.deliveryMethod || 'pickup',
+          deliveryAddress: data.deliveryAddress,
+          deliveryFee: data.deliveryFee,
+          estimatedDeliveryTime: data.estimatedDeliveryTime?.toDate(),
+          paymentPreference: data.paymentPreference,
+          paymentPhotoUrl: data.paymentPhotoUrl,
+          requiresPaymentConfirmation: data.requiresPaymentConfirmation,
+          customerNotes: data.customerNotes,
+          source: data.source || 'web',
+          tableNumber: data.tableNumber,
+          telegramId: data.telegramId,
+          telegramUsername: data.telegramUsername,
+          trackingNumber: data.trackingNumber,
+          createdAt: data.createdAt?.toDate() || new Date(),
+          updatedAt: data.updatedAt?.toDate() || new Date(),
+          confirmedAt: data.confirmedAt?.toDate(),
+          shippedAt: data.shippedAt?.toDate(),
+          deliveredAt: data.deliveredAt?.toDate()
         }
+        userOrders.push(order)
       })
 
       setOrders(userOrders)
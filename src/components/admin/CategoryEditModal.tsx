@@ -10,6 +10,11 @@ interface CategoryEditModalProps {
   onCancel: () => void
 }
 
+const CATEGORY_ICONS = [
+  '📦', '🍕', '🍔', '☕', '🥗', '🍰', '👕', '📱',
+  '💻', '🎮', '📚', '🏠', '🚗', '⚽', '🎵', '🎨'
+]
+
 const CategoryEditModal: React.FC<CategoryEditModalProps> = ({ 
   category, 
   userId, 
@@ -28,11 +33,6 @@ const CategoryEditModal: React.FC<CategoryEditModalProps> = ({
     shopId: shopId
   })
 
-  const predefinedIcons = [
-    '📦', '🍕', '🍔', '☕', '🥗', '🍰', '👕', '📱',
-    '💻', '🎮', '📚', '🏠', '🚗', '⚽', '🎵', '🎨'
-  ]
-
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault()
     
@@ -108,7 +108,7 @@ const CategoryEditModal: React.FC<CategoryEditModalProps> = ({
               </div>
               
               <div className="grid grid-cols-8 gap-2">
-                {predefinedIcons.map((icon) => (
+                {CATEGORY_ICONS.map((icon) => (
                   <button
                     key={icon}
                     type="button"
@@ -12,6 +12,28 @@ interface DepartmentEditModalProps {
   onCancel: () => void
 }
 
+const DEPARTMENT_ROLES = [
+  { value: 'admin', label: 'Admin', description: 'Receives all notifications and manages operations' },
+  { value: 'shop', label: 'Shop', description: 'Receives shop and order notifications' },
+  { value: 'delivery', label: 'Delivery', description: 'Handles delivery and shipping notifications' }
+]
+
+const NOTIFICATION_TYPES = [
+  'new_order',
+  'order_confirmed',
+  'order_ready',
+  'order_shipped',
+  'payment_received',
+  'low_stock',
+  'promotions',
+  'order_cancelled'
+]
+
+const DEPARTMENT_ICONS = [
+  '👥', '🍳', '💰', '👨‍💼', '🚚', '📞', '📋', '⚙️',
+  '🔔', '📊', '💼', '🏪', '📦', '🛒', '💳', '📱'
+]
+
 const DepartmentEditModal: React.FC<DepartmentEditModalProps> = ({ 
   department, 
   userId, 
@@ -42,28 +64,6 @@ const DepartmentEditModal: React.FC<DepartmentEditModalProps> = ({
     }
   }, [propBotToken])
 
-  const roles = [
-    { value: 'admin', label: 'Admin', description: 'Receives all notifications and manages operations' },
-    { value: 'shop', label: 'Shop', description: 'Receives shop and order notifications' },
-    { value: 'delivery', label: 'Delivery', description: 'Handles delivery and shipping notifications' }
-  ]
-
-  const notificationTypes = [
-    'new_order',
-    'order_confirmed',
-    'order_ready',
-    'order_shipped',
-    'payment_received',
-    'low_stock',
-    'promotions',
-    'order_cancelled'
-  ]
-
-  const predefinedIcons = [
-    '👥', '🍳', '💰', '👨‍💼', '🚚', '📞', '📋', '⚙️',
-    '🔔', '📊', '💼', '🏪', '📦', '🛒', '💳', '📱'
-  ]
-
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault()
     
@@ -141,7 +141,7 @@ const DepartmentEditModal: React.FC<DepartmentEditModalProps> = ({
                 className="w-full p-3 border rounded-lg bg-telegram-secondary-bg text-telegram-text"
                 required
               >
-                {roles.map((role) => (
+                {DEPARTMENT_ROLES.map((role) => (
                   <option key={role.value} value={role.value}>
                     {role.label} - {role.description}
                   </option>
@@ -207,7 +207,7 @@ const DepartmentEditModal: React.FC<DepartmentEditModalProps> = ({
               </div>
               
               <div className="grid grid-cols-8 gap-2">
-                {predefinedIcons.map((icon) => (
+                {DEPARTMENT_ICONS.map((icon) => (
                   <button
                     key={icon}
                     type="button"
@@ -233,7 +233,7 @@ const DepartmentEditModal: React.FC<DepartmentEditModalProps> = ({
             </h4>
             
             <div className="grid md:grid-cols-2 gap-3">
-              {notificationTypes.map((type) => (
+              {NOTIFICATION_TYPES.map((type) => (
                 <div key={type} className="flex items-center">
                   <input
                     type="checkbox"
@@ -2,7 +2,7 @@ import React, { useState, useEffect, useRef, useMemo } from 'react'
 import { QRCodeSVG } from 'qrcode.react'
 import { Html5QrcodeScanner, Html5QrcodeSupportedFormats } from 'html5-qrcode'
 import { 
-  collection, query, where, getDocs, doc, updateDoc, addDoc, writeBatch 
+  collection, query, where, getDocs, doc, updateDoc, writeBatch 
 } from 'firebase/firestore'
 import { useFirebase } from '../../contexts/FirebaseContext'
 import { Product, Shop, InventoryLog } from '../../types'
@@ -33,6 +33,30 @@ interface StocktakeRow {
   status: 'pending' | 'counted' | 'matched' | 'mismatch'
 }
 
+// Firestore caps a write batch at 500 operations; each stock change is a
+// product update plus an inventory log entry
+const STOCK_UPDATES_PER_BATCH = 250
+type StockAdjustType = 'stock_in' | 'stock_out' | 'adjustment' | 'damage'
+type BulkActionType = 'stock_in' | 'stock_out' | 'set_stock'
+
+// How each adjustment type turns the current stock and entered quantity into new stock
+const STOCK_ADJUSTERS: Record<StockAdjustType, (prevStock: number, qty: number) => number> = {
+  stock_in: (prevStock, qty) => prevStock + Math.abs(qty),
+  stock_out: (prevStock, qty) => Math.max(0, prevStock - Math.abs(qty)),
+  damage: (prevStock, qty) => Math.max(0, prevStock - Math.abs(qty)),
+  adjustment: (_prevStock, qty) => Math.max(0, qty)
+}
+
+// Bulk actions reuse the single-product adjusters and are logged under the same type
+const BULK_ACTION_ADJUST_TYPES: Record<BulkActionType, StockAdjustType> = {
+  stock_in: 'stock_in',
+  stock_out: 'stock_out',
+  set_stock: 'adjustment'
+}
+
+// Whole-number stock cells only; parseInt alone would accept values like "12abc"
+const CSV_STOCK_PATTERN = /^-?\d+$/
+
 export const InventoryManager: React.FC<InventoryManagerProps> = ({
   shop,
   products,
@@ -51,7 +75,7 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
   // Selected product for single adjustment
   const [selectedProduct, setSelectedProduct] = useState<Product | null>(null)
   const [stockChangeQty, setStockChangeQty] = useState<number>(1)
-  const [adjustType, setAdjustType] = useState<'stock_in' | 'stock_out' | 'adjustment' | 'damage'>('stock_in')
+  const [adjustType, setAdjustType] = useState<StockAdjustType>('stock_in')
   const [adjustNotes, setAdjustNotes] = useState('')
   const [saving, setSaving] = useState(false)
   const [message, setMessage] = useState<{ type: 'success' | 'error'; text: string } | null>(null)
@@ -60,7 +84,7 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
   const [selectedProductIds, setSelectedProductIds] = useState<string[]>([])
   const [showBulkAdjustModal, setShowBulkAdjustModal] = useState(false)
   const [bulkQty, setBulkQty] = useState<number>(5)
-  const [bulkActionType, setBulkActionType] = useState<'stock_in' | 'stock_out' | 'set_stock'>('stock_in')
+  const [bulkActionType, setBulkActionType] = useState<BulkActionType>('stock_in')
 
   // QR Scanning State
   const [showScanner, setShowScanner] = useState(false)
@@ -139,13 +163,24 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
   // Extract unique categories from products
   const categoriesList = Array.from(new Set(products.map(p => p.category).filter(Boolean)))
 
-  // Calculate Key Inventory Metrics
-  const totalItemsCount = products.reduce((acc, p) => acc + (p.stock || 0), 0)
-  const totalValuation = products.reduce((acc, p) => acc + ((p.stock || 0) * (p.price || 0)), 0)
-  const totalCostValue = products.reduce((acc, p) => acc + ((p.stock || 0) * (p.costPrice || 0)), 0)
+  // Calculate Key Inventory Metrics in one pass, counting matches instead of
+  // building filtered arrays just to read their length
+  const { totalItemsCount, totalValuation, totalCostValue, lowStockCount, outOfStockCount } = useMemo(() => {
+    const metrics = { totalItemsCount: 0, totalValuation: 0, totalCostValue: 0, lowStockCount: 0, outOfStockCount: 0 }
+    products.forEach(p => {
+      const stock = p.stock || 0
+      metrics.totalItemsCount += stock
+      metrics.totalValuation += stock * (p.price || 0)
+      metrics.totalCostValue += stock * (p.costPrice || 0)
+      if (stock <= 0) {
+        metrics.outOfStockCount++
+      } else if (stock <= (p.lowStockAlert || 5)) {
+        metrics.lowStockCount++
+      }
+    })
+    return metrics
+  }, [products])
   const totalPotentialProfit = totalValuation - totalCostValue
-  const lowStockCount = products.filter(p => (p.stock || 0) <= (p.lowStockAlert || 5) && (p.stock || 0) > 0).length
-  const outOfStockCount = products.filter(p => (p.stock || 0) <= 0).length
   const avgStockPerProduct = products.length > 0 ? Math.round(totalItemsCount / products.length) : 0
 
   // Category Valuation Breakdown
@@ -216,8 +251,9 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
       targetId = targetId.replace('woodshop:product:', '')
     }
 
+    const targetSku = targetId.toLowerCase()
     const matched = products.find(
-      p => p.id === targetId || (p.sku && p.sku.toLowerCase() === targetId.toLowerCase())
+      p => p.id === targetId || (p.sku && p.sku.toLowerCase() === targetSku)
     )
 
     if (matched) {
@@ -250,14 +286,14 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
       const prevStock = product.stock || 0
       const newStock = Math.max(0, prevStock + delta)
 
-      const productRef = doc(db, 'products', product.id)
-      await updateDoc(productRef, {
+      // Commit the stock change and its audit log together in one round-trip
+      const now = new Date()
+      const batch = writeBatch(db)
+      batch.update(doc(db, 'products', product.id), {
         stock: newStock,
-        updatedAt: new Date()
+        updatedAt: now
       })
-
-      const logsRef = collection(db, 'inventory_logs')
-      await addDoc(logsRef, {
+      batch.set(doc(collection(db, 'inventory_logs')), {
         shopId: shop.id,
         productId: product.id,
         productName: product.name,
@@ -268,8 +304,9 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
         type: delta > 0 ? 'stock_in' : 'stock_out',
         notes: `Quick adjust ${delta > 0 ? '+' : ''}${delta}`,
         performedBy: performedBy || 'Shop Admin',
-        createdAt: new Date()
+        createdAt: now
       })
+      await batch.commit()
 
       setMessage({ type: 'success', text: `${product.name}: ${prevStock} → ${newStock}` })
       onRefreshProducts()
@@ -289,26 +326,17 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
       setMessage(null)
 
       const prevStock = selectedProduct.stock || 0
-      let newStock = prevStock
-
-      if (adjustType === 'stock_in') {
-        newStock = prevStock + Math.abs(stockChangeQty)
-      } else if (adjustType === 'stock_out' || adjustType === 'damage') {
-        newStock = Math.max(0, prevStock - Math.abs(stockChangeQty))
-      } else if (adjustType === 'adjustment') {
-        newStock = Math.max(0, stockChangeQty)
-      }
+      const newStock = STOCK_ADJUSTERS[adjustType](prevStock, stockChangeQty)
 
       const diff = newStock - prevStock
 
-      const productRef = doc(db, 'products', selectedProduct.id)
-      await updateDoc(productRef, {
+      const now = new Date()
+      const batch = writeBatch(db)
+      batch.update(doc(db, 'products', selectedProduct.id), {
         stock: newStock,
-        updatedAt: new Date()
+        updatedAt: now
       })
-
-      const logsRef = collection(db, 'inventory_logs')
-      await addDoc(logsRef, {
+      batch.set(doc(collection(db, 'inventory_logs')), {
         shopId: shop.id,
         productId: selectedProduct.id,
         productName: selectedProduct.name,
@@ -319,8 +347,9 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
         type: adjustType,
         notes: adjustNotes.trim(),
         performedBy: performedBy || 'Shop Admin',
-        createdAt: new Date()
+        createdAt: now
       })
+      await batch.commit()
 
       setMessage({ 
         type: 'success', 
@@ -366,32 +395,29 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
       setSaving(true)
       setMessage(null)
 
-      const batch = writeBatch(db)
+      const now = new Date()
       const logsRef = collection(db, 'inventory_logs')
+      let batch = writeBatch(db)
 
       let updatedCount = 0
 
+      const logType = BULK_ACTION_ADJUST_TYPES[bulkActionType]
+      const adjustStock = STOCK_ADJUSTERS[logType]
+      const productsById = new Map(products.map(p => [p.id, p]))
+
       for (const id of selectedProductIds) {
-        const prod = products.find(p => p.id === id)
+        const prod = productsById.get(id)
         if (!prod) continue
 
         const prevStock = prod.stock || 0
-        let newStock = prevStock
-
-        if (bulkActionType === 'stock_in') {
-          newStock = prevStock + Math.abs(bulkQty)
-        } else if (bulkActionType === 'stock_out') {
-          newStock = Math.max(0, prevStock - Math.abs(bulkQty))
-        } else if (bulkActionType === 'set_stock') {
-          newStock = Math.max(0, bulkQty)
-        }
+        const newStock = adjustStock(prevStock, bulkQty)
 
         const diff = newStock - prevStock
 
         const prodRef = doc(db, 'products', prod.id)
-        batch.update(prodRef, { stock: newStock, updatedAt: new Date() })
+        batch.update(prodRef, { stock: newStock, updatedAt: now })
 
-        await addDoc(logsRef, {
+        batch.set(doc(logsRef), {
           shopId: shop.id,
           productId: prod.id,
           productName: prod.name,
@@ -399,13 +425,17 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
           previousStock: prevStock,
           newStock: newStock,
           changeQuantity: diff,
-          type: bulkActionType === 'stock_in' ? 'stock_in' : (bulkActionType === 'stock_out' ? 'stock_out' : 'adjustment'),
+          type: logType,
           notes: `Batch update for ${selectedProductIds.length} items`,
           performedBy: performedBy || 'Shop Admin',
-          createdAt: new Date()
+          createdAt: now
         })
 
         updatedCount++
+        if (updatedCount % STOCK_UPDATES_PER_BATCH === 0) {
+          await batch.commit()
+          batch = writeBatch(db)
+        }
       }
 
       await batch.commit()
@@ -502,27 +532,37 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
         throw new Error('CSV must contain a "stock" column.')
       }
 
+      // Index products by id and lowercased SKU once instead of scanning the list per row
+      const productsById = new Map(products.map(p => [p.id, p]))
+      const productsBySku = new Map<string, Product>()
+      products.forEach(p => {
+        const skuKey = p.sku?.toLowerCase()
+        if (skuKey && !productsBySku.has(skuKey)) productsBySku.set(skuKey, p)
+      })
+
+      const now = new Date()
+      const logsRef = collection(db, 'inventory_logs')
+      let batch = writeBatch(db)
       let updatedCount = 0
 
       for (let i = 1; i < lines.length; i++) {
         const row = lines[i].split(',').map(cell => cell.trim().replace(/^"|"$/g, ''))
         const targetId = idIdx !== -1 ? row[idIdx] : null
         const targetSku = skuIdx !== -1 ? row[skuIdx] : null
-        const newStock = parseInt(row[stockIdx])
+        const stockCell = row[stockIdx]
 
-        if (isNaN(newStock)) continue
+        if (!stockCell || !CSV_STOCK_PATTERN.test(stockCell)) continue
+        const newStock = parseInt(stockCell, 10)
 
-        const matched = products.find(p => 
-          (targetId && p.id === targetId) || 
-          (targetSku && p.sku && p.sku.toLowerCase() === targetSku.toLowerCase())
-        )
+        const matched = (targetId && productsById.get(targetId)) ||
+          (targetSku && productsBySku.get(targetSku.toLowerCase())) ||
+          undefined
 
         if (matched) {
           const productRef = doc(db, 'products', matched.id)
-          await updateDoc(productRef, { stock: Math.max(0, newStock), updatedAt: new Date() })
+          batch.update(productRef, { stock: Math.max(0, newStock), updatedAt: now })
 
-          const logsRef = collection(db, 'inventory_logs')
-          await addDoc(logsRef, {
+          batch.set(doc(logsRef), {
             shopId: shop.id,
             productId: matched.id,
             productName: matched.name,
@@ -533,13 +573,19 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
             type: 'adjustment',
             notes: `CSV Import update from file: ${importFile.name}`,
             performedBy: performedBy || 'CSV Import',
-            createdAt: new Date()
+            createdAt: now
           })
 
           updatedCount++
+          if (updatedCount % STOCK_UPDATES_PER_BATCH === 0) {
+            await batch.commit()
+            batch = writeBatch(db)
+          }
         }
       }
 
+      await batch.commit()
+
       setMessage({ type: 'success', text: `CSV Import completed! Updated ${updatedCount} products.` })
       setShowImportModal(false)
       setImportFile(null)
@@ -552,6 +598,9 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
     }
   }
 
+  // Set view of the selection for the per-row checked lookup in the product list
+  const selectedProductIdSet = useMemo(() => new Set(selectedProductIds), [selectedProductIds])
+
   // Toggle selection of products for bulk actions
   const toggleSelectAll = () => {
     if (selectedProductIds.length === filteredProducts.length) {
@@ -615,15 +664,17 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
 
     try {
       setStocktakeSaving(true)
-      const batch = writeBatch(db)
+      const now = new Date()
       const logsRef = collection(db, 'inventory_logs')
+      let batch = writeBatch(db)
 
-      for (const row of mismatches) {
+      for (let i = 0; i < mismatches.length; i++) {
+        const row = mismatches[i]
         const prodRef = doc(db, 'products', row.productId)
         const newStock = Math.max(0, row.countedStock!)
-        batch.update(prodRef, { stock: newStock, updatedAt: new Date() })
+        batch.update(prodRef, { stock: newStock, updatedAt: now })
 
-        await addDoc(logsRef, {
+        batch.set(doc(logsRef), {
           shopId: shop.id,
           productId: row.productId,
           productName: row.productName,
@@ -634,8 +685,13 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
           type: 'adjustment',
           notes: `Stocktake adjustment (variance: ${row.variance > 0 ? '+' : ''}${row.variance})`,
           performedBy: performedBy || 'Stocktake',
-          createdAt: new Date()
+          createdAt: now
         })
+
+        if ((i + 1) % STOCK_UPDATES_PER_BATCH === 0) {
+          await batch.commit()
+          batch = writeBatch(db)
+        }
       }
 
       await batch.commit()
@@ -659,7 +715,8 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
         if (targetId.startsWith('woodshop:product:')) {
           targetId = targetId.replace('woodshop:product:', '')
         }
-        const row = stocktakeRows.find(r => r.productId === targetId || r.sku.toLowerCase() === targetId.toLowerCase())
+        const targetSku = targetId.toLowerCase()
+        const row = stocktakeRows.find(r => r.productId === targetId || r.sku.toLowerCase() === targetSku)
         if (row) {
           // Focus the input for this row (increment count by 1)
           const current = row.countedStock ?? 0
@@ -679,10 +736,11 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
   }
 
   // Filter & Sort Products List
+  const normalizedQuery = searchQuery.toLowerCase()
   const filteredProducts = products.filter(p => {
-    const matchesSearch = 
-      p.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
-      (p.sku && p.sku.toLowerCase().includes(searchQuery.toLowerCase()))
+    const matchesSearch = !normalizedQuery ||
+      p.name.toLowerCase().includes(normalizedQuery) ||
+      (p.sku && p.sku.toLowerCase().includes(normalizedQuery))
     
     let matchesStatus = true
     if (statusFilter === 'low_stock') {
@@ -1193,7 +1251,7 @@ export const InventoryManager: React.FC<InventoryManagerProps> = ({
               filteredProducts.map((p) => {
                 const isLowStock = (p.stock || 0) <= (p.lowStockAlert || 5) && (p.stock || 0) > 0
                 const isOutOfStock = (p.stock || 0) <= 0
-                const isChecked = selectedProductIds.includes(p.id)
+                const isChecked = selectedProductIdSet.has(p.id)
                 const isSelected = selectedProduct?.id === p.id
                 const profitMargin = p.costPrice && p.costPrice > 0 ? (((p.price - p.costPrice) / p.price) * 100) : null
                 const isQuickAdjusting = quickAdjustingId === p.id
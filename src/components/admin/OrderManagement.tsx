@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react'
 import { Clock, CheckCircle, XCircle, Eye, Filter, Download, MessageSquare, AlertCircle, Truck, Package, Bell, X } from 'lucide-react'
-import { collection, query, where, getDocs, doc, updateDoc, orderBy, onSnapshot, addDoc } from 'firebase/firestore'
+import { collection, query, where, doc, updateDoc, orderBy, onSnapshot, addDoc } from 'firebase/firestore'
 import { useFirebase } from '../../contexts/FirebaseContext'
 import { useTelegram } from '../../contexts/TelegramContext'
 import { Order, Department } from '../../types'
@@ -11,6 +11,15 @@ interface OrderManagementProps {
 
 type OrderStatus = 'pending' | 'confirmed' | 'processing' | 'shipped' | 'delivered' | 'cancelled'
 
+// Order field stamped when an order enters each status
+const STATUS_TIMESTAMP_FIELDS: Partial<Record<OrderStatus, string>> = {
+  confirmed: 'confirmedAt',
+  processing: 'processingAt',
+  shipped: 'shippedAt',
+  delivered: 'deliveredAt',
+  cancelled: 'cancelledAt'
+}
+
 const OrderManagement: React.FC<OrderManagementProps> = ({ selectedShopId }) => {
   const { db } = useFirebase()
   const { user } = useTelegram()
@@ -25,13 +34,15 @@ const OrderManagement: React.FC<OrderManagementProps> = ({ selectedShopId }) =>
   const [newOrderNotifications, setNewOrderNotifications] = useState<Order[]>([])
 
   useEffect(() => {
-    if (selectedShopId) {
-      loadDepartments()
-      setupOrdersListener()
-    }
+    if (!selectedShopId) return
+
+    const unsubscribeDepartments = setupDepartmentsListener()
+    const unsubscribeOrders = setupOrdersListener()
     
     return () => {
-      // Cleanup listeners when component unmounts
+      // Cleanup listeners when the shop changes or the component unmounts
+      unsubscribeDepartments?.()
+      unsubscribeOrders?.()
     }
   }, [selectedShopId])
 
@@ -126,8 +137,8 @@ const OrderManagement: React.FC<OrderManagementProps> = ({ selectedShopId }) =>
     }
   }
 
-  const loadDepartments = async () => {
-    if (!selectedShopId) return
+  const setupDepartmentsListener = () => {
+    if (!selectedShopId || !db) return
 
     try {
       const departmentsRef = collection(db, 'departments')
@@ -137,32 +148,40 @@ const OrderManagement: React.FC<OrderManagementProps> = ({ selectedShopId }) =>
         where('isActive', '==', true)
       )
       
-      const departmentsSnapshot = await getDocs(departmentsQuery)
-      const departmentsList: Department[] = []
-      
-      departmentsSnapshot.forEach((doc) => {
-        const data = doc.data()
-        const department: Department = {
-          id: doc.id,
-          userId: data.userId || '',
-          shopId: data.shopId || '',
-          name: data.name || '',
-          telegramChatId: data.telegramChatId || '',
-          adminChatId: data.adminChatId || '',
-          role: data.role || 'shop',
-          order: data.order || 0,
-          icon: data.icon || '👥',
-          isActive: data.isActive !== false,
-          notificationTypes: data.notificationTypes || [],
-          createdAt: data.createdAt?.toDate() || new Date(),
-          updatedAt: data.updatedAt?.toDate() || new Date()
-        }
-        departmentsList.push(department)
-      })
+      // Keep notification targets live instead of loading them once per shop selection
+      return onSnapshot(
+        departmentsQuery,
+        (departmentsSnapshot) => {
+          const departmentsList: Department[] = []
+          
+          departmentsSnapshot.forEach((doc) => {
+            const data = doc.data()
+            const department: Department = {
+              id: doc.id,
+              userId: data.userId || '',
+              shopId: data.shopId || '',
+              name: data.name || '',
+              telegramChatId: data.telegramChatId || '',
+              adminChatId: data.adminChatId || '',
+              role: data.role || 'shop',
+              order: data.order || 0,
+              icon: data.icon || '👥',
+              isActive: data.isActive !== false,
+              notificationTypes: data.notificationTypes || [],
+              createdAt: data.createdAt?.toDate() || new Date(),
+              updatedAt: data.updatedAt?.toDate() || new Date()
+            }
+            departmentsList.push(department)
+          })
 
-      setDepartments(departmentsList)
+          setDepartments(departmentsList)
+        },
+        (error) => {
+          console.error('Error in departments listener:', error)
+        }
+      )
     } catch (error) {
-      console.error('Error loading departments:', error)
+      console.error('Error setting up departments listener:', error)
     }
   }
 
@@ -173,22 +192,16 @@ const OrderManagement: React.FC<OrderManagementProps> = ({ selectedShopId }) =>
 
     try {
       const orderRef = doc(db, 'orders', orderId)
+      const now = new Date()
       const updateData: any = {
         status: newStatus,
-        updatedAt: new Date()
+        updatedAt: now
       }
 
       // Add timestamp for specific status changes
-      if (newStatus === 'confirmed') {
-        updateData.confirmedAt = new Date()
-      } else if (newStatus === 'processing') {
-        updateData.processingAt = new Date()
-      } else if (newStatus === 'shipped') {
-        updateData.shippedAt = new Date()
-      } else if (newStatus === 'delivered') {
-        updateData.deliveredAt = new Date()
-      } else if (newStatus === 'cancelled') {
-        updateData.cancelledAt = new Date()
+      const timestampField = STATUS_TIMESTAMP_FIELDS[newStatus]
+      if (timestampField) {
+        updateData[timestampField] = now
       }
 
       await updateDoc(orderRef, updateData)
@@ -196,7 +209,7 @@ const OrderManagement: React.FC<OrderManagementProps> = ({ selectedShopId }) =>
       // Update local state
       setOrders(prev => prev.map(order => 
         order.id === orderId 
-          ? { ...order, status: newStatus, updatedAt: new Date() }
+          ? { ...order, status: newStatus, updatedAt: now }
           : order
       ))
 
@@ -153,31 +153,13 @@ export const PromotionModal: React.FC<PromotionModalProps> = ({
   }
 
   const generatePreviewMessage = () => {
-    const discountText = discountPercentage > 0 ? `\n💥 <b>${discountPercentage}% OFF!</b>` : ''
-    const originalPrice = discountPercentage > 0 ? `\n~~$${product.price.toFixed(2)}~~ ` : ''
-    const discountedPrice = discountPercentage > 0 ? `<b>$${(product.price * (1 - discountPercentage / 100)).toFixed(2)}</b>` : `<b>$${product.price.toFixed(2)}</b>`
-    const validUntilText = validUntil ? `\n⏰ <b>Valid until:</b> ${new Date(validUntil).toLocaleDateString()}` : ''
-    const tagsText = tags.length > 0 ? `\n\n${tags.join(' ')}` : ''
-
-    const botUsername = import.meta.env.VITE_TELEGRAM_BOT_USERNAME || 'shop_test3_bot'
-    const productLink = shopLinkUtils.generateShopLink(product.shopId, { productId: product.id, botUsername })
-
-    return `
-🔥 <b>${promotionTitle}</b>${discountText}
-
-🛍️ <b>${product.name}</b>
-
-${customMessage || product.description}
-
-💰 <b>Price:</b> ${originalPrice}${discountedPrice}
-${product.sku ? `🏷️ <b>SKU:</b> ${product.sku}` : ''}${validUntilText}
-
-🛒 <b>Order Now!</b> Don't miss this amazing deal!${tagsText}
-
-👉 <a href="${productLink}">View Product</a>
-
-<i>🚀 Limited time offer - Order today!</i>
-    `.trim()
+    return shopLinkUtils.generatePromotionMessage(product, {
+      promotionTitle,
+      customMessage,
+      discountPercentage,
+      validUntil: validUntil || undefined,
+      tags
+    })
   }
 
   if (previewMode) {
@@ -218,7 +200,6 @@ ${product.sku ? `🏷️ <b>SKU:</b> ${product.sku}` : ''}${validUntilText}
                     .replace(/<\/b>/g, '</strong>')
                     .replace(/<i>/g, '<em>')
                     .replace(/<\/i>/g, '</em>')
-                    .replace(/~~(.+?)~~/g, '<del>$1</del>')
                 }}
               />
             </div>
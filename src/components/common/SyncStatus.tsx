@@ -21,9 +21,9 @@ const SyncStatus: React.FC = () => {
     }
 
     updateStatus()
-    const interval = setInterval(updateStatus, 5000) // Update every 5 seconds
 
-    return () => clearInterval(interval)
+    // Refresh only when connectivity or the sync queue actually changes
+    return cacheSyncService.onSyncStatusChange(updateStatus)
   }, [])
 
   const handleForceSync = async () => {
@@ -77,7 +77,8 @@ const CRMMessageComposer: React.FC<CRMMessageComposerProps> = ({
       let successCount = 0
       let failCount = 0
 
-      for (const contact of contacts) {
+      // telegramService paces sends to Telegram's rate limits, so contacts can be queued together
+      await Promise.all(contacts.map(async (contact) => {
         try {
           const personalizedMessage = replaceTemplateVariables(
             message,
@@ -102,13 +103,11 @@ const CRMMessageComposer: React.FC<CRMMessageComposerProps> = ({
           } else {
             failCount++
           }
-
-          await new Promise(resolve => setTimeout(resolve, 100))
         } catch (error) {
           console.error(`Failed to send to ${contact.name}:`, error)
           failCount++
         }
-      }
+      }))
 
       alert(
         `Message sent!\nSuccess: ${successCount}\nFailed: ${failCount}`
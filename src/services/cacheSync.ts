@@ -30,16 +30,19 @@ class CacheSyncService {
   private syncInProgress: boolean = false
   private listeners: Map<string, () => void> = new Map()
   private syncIntervalId: NodeJS.Timeout | null = null
+  private statusListeners: Set<() => void> = new Set()
 
   constructor() {
     // Listen for online/offline events
     window.addEventListener('online', () => {
       this.isOnlineStatus = true
+      this.notifyStatusChange()
       this.startSync()
     })
     
     window.addEventListener('offline', () => {
       this.isOnlineStatus = false
+      this.notifyStatusChange()
       this.stopSync()
     })
   }
@@ -66,33 +69,39 @@ class CacheSyncService {
   }
 
   private async initialDataLoad() {
-    if (!this.db) return
+    const db = this.db
+    if (!db) return
     
     console.log('Starting initial data load...')
     const collections = ['shops', 'products', 'categories', 'departments', 'orders', 'users']
     
-    for (const collectionName of collections) {
+    // Collections are independent, so fetch and cache them concurrently
+    await Promise.all(collections.map(async (collectionName) => {
       try {
-        const collectionRef = collection(this.db, collectionName)
+        const collectionRef = collection(db, collectionName)
         const snapshot = await getDocs(collectionRef)
         
         console.log(`Loading ${snapshot.docs.length} items from ${collectionName}`)
         
-        for (const docSnapshot of snapshot.docs) {
+        const items = snapshot.docs.map(docSnapshot => {
           const data = docSnapshot.data()
-          await indexedDBService.set(collectionName, docSnapshot.id, {
+          return {
             id: docSnapshot.id,
-            ...data,
-            updatedAt: data.updatedAt?.toDate() || new Date(),
-            createdAt: data.createdAt?.toDate() || new Date()
-          }, true)
-        }
+            data: {
+              id: docSnapshot.id,
+              ...data,
+              updatedAt: data.updatedAt?.toDate() || new Date(),
+              createdAt: data.createdAt?.toDate() || new Date()
+            }
+          }
+        })
+        await indexedDBService.setMany(collectionName, items, true)
         
         console.log(`Successfully cached ${snapshot.docs.length} items from ${collectionName}`)
       } catch (error) {
         console.error(`Error loading initial data from ${collectionName}:`, error)
       }
-    }
+    }))
     
     console.log('Initial data load completed')
   }
@@ -135,6 +144,7 @@ class CacheSyncService {
       console.error('Sync error:', error)
     } finally {
       this.syncInProgress = false
+      this.notifyStatusChange()
     }
   }
 
@@ -267,14 +277,20 @@ class CacheSyncService {
 
   async setCachedData<T>(collectionName: string, id: string, data: T, syncToFirebase: boolean = true): Promise<void> {
     try {
+      const shouldQueue = syncToFirebase && this.isOnlineStatus
+
+      // Look at the cached copy before overwriting it; reading it back afterwards
+      // would always see the unsynced write and queue a create
+      const existingItem = shouldQueue ? await indexedDBService.get(collectionName, id) : null
+
       // Store in cache immediately
       await indexedDBService.set(collectionName, id, data, !syncToFirebase)
       
       // Add to sync queue if needed
-      if (syncToFirebase && this.isOnlineStatus) {
-        const existingItem = await indexedDBService.get(collectionName, id)
+      if (shouldQueue) {
         const operation = existingItem?.synced ? 'update' : 'create'
         await indexedDBService.addToSyncQueue(collectionName, operation, data)
+        this.notifyStatusChange()
         
         // Trigger immediate sync for important operations
         if (!this.syncInProgress) {
@@ -291,6 +307,7 @@ class CacheSyncService {
     try {
       if (syncToFirebase && this.isOnlineStatus) {
         await indexedDBService.addToSyncQueue(collectionName, 'delete', { id })
+        this.notifyStatusChange()
       }
       
       await indexedDBService.delete(collectionName, id)
@@ -341,8 +358,9 @@ class CacheSyncService {
 
     const collectionRef = collection(this.db, collectionName)
     let q = collectionRef
+    const isFiltered = !!queryConstraints && queryConstraints.length > 0
 
-    if (queryConstraints && queryConstraints.length > 0) {
+    if (isFiltered) {
       q = query(collectionRef, ...queryConstraints)
     }
 
@@ -350,6 +368,7 @@ class CacheSyncService {
     const unsubscribe = onSnapshot(q, 
       (snapshot) => {
         const data: T[] = []
+        const itemsById = new Map<string, T>()
         snapshot.forEach(doc => {
           const docData = doc.data()
           const item = {
@@ -359,10 +378,27 @@ class CacheSyncService {
             updatedAt: docData.updatedAt?.toDate() || new Date()
           } as T
           data.push(item)
-          
-          // Update cache in background
-          indexedDBService.set(collectionName, doc.id, item, true)
+          itemsById.set(doc.id, item)
+        })
+
+        // Update cache in background, writing only the documents this snapshot changed
+        const changedItems: { id: string; data: T }[] = []
+        snapshot.docChanges().forEach(change => {
+          if (change.type === 'removed') {
+            // With query constraints, 'removed' only means the doc left this query; the
+            // cache holds the whole collection, so keep it unless the listener is unfiltered
+            if (isFiltered) return
+            indexedDBService.delete(collectionName, change.doc.id).catch(error => {
+              console.error(`Error removing ${change.doc.id} from ${collectionName} cache:`, error)
+            })
+          } else {
+            changedItems.push({ id: change.doc.id, data: itemsById.get(change.doc.id)! })
+          }
+        })
+        indexedDBService.setMany(collectionName, changedItems, true).catch(error => {
+          console.error(`Error caching ${collectionName} changes:`, error)
         })
+
         callback(data)
       },
       (error) => {
@@ -381,6 +417,18 @@ class CacheSyncService {
     return unsubscribe
   }
 
+  // Subscribe to changes in connectivity or the pending sync queue; returns an unsubscribe function
+  onSyncStatusChange(listener: () => void): () => void {
+    this.statusListeners.add(listener)
+    return () => {
+      this.statusListeners.delete(listener)
+    }
+  }
+
+  private notifyStatusChange() {
+    this.statusListeners.forEach(listener => listener())
+  }
+
   // Utility methods
   isOffline(): boolean {
     return !this.isOnlineStatus
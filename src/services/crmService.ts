@@ -20,6 +20,7 @@ import {
   CRMAutoTagRule,
   CRMStats
 } from '../types'
+import { getDocsByIds } from '../utils/firestoreQueries'
 
 export const getContactsByShop = async (shopId: string): Promise<CRMContact[]> => {
   const shopCustomersQuery = query(
@@ -38,20 +39,10 @@ export const getContactsByShop = async (shopId: string): Promise<CRMContact[]> =
 
   const usersMap = new Map()
 
-  const chunkSize = 10
-  for (let i = 0; i < customerIds.length; i += chunkSize) {
-    const chunk = customerIds.slice(i, i + chunkSize)
-    if (chunk.length > 0) {
-      const usersQuery = query(
-        collection(db, 'users'),
-        where('__name__', 'in', chunk)
-      )
-      const usersSnapshot = await getDocs(usersQuery)
-      usersSnapshot.docs.forEach(doc => {
-        usersMap.set(doc.id, { id: doc.id, ...doc.data() })
-      })
-    }
-  }
+  const userDocs = await getDocsByIds(db, 'users', customerIds)
+  userDocs.forEach(doc => {
+    usersMap.set(doc.id, { id: doc.id, ...doc.data() })
+  })
 
   const ordersQuery = query(
     collection(db, 'orders'),
@@ -237,10 +228,11 @@ export const updateContactNotes = async (
   notes: string
 ): Promise<void> => {
   const docRef = doc(db, 'crm_contacts', contactId)
+  const now = Timestamp.now()
   await updateDoc(docRef, {
     notes,
-    lastNoteUpdate: Timestamp.now(),
-    updatedAt: Timestamp.now()
+    lastNoteUpdate: now,
+    updatedAt: now
   })
 }
 
@@ -248,9 +240,10 @@ export const updateContactLastContacted = async (
   contactId: string
 ): Promise<void> => {
   const docRef = doc(db, 'crm_contacts', contactId)
+  const now = Timestamp.now()
   await updateDoc(docRef, {
-    lastContactedDate: Timestamp.now(),
-    updatedAt: Timestamp.now()
+    lastContactedDate: now,
+    updatedAt: now
   })
 }
 
@@ -317,13 +310,14 @@ export const createTag = async (
   description?: string
 ): Promise<string> => {
   const docRef = doc(collection(db, 'crm_tags'))
+  const now = Timestamp.now()
   await setDoc(docRef, {
     shopId,
     name,
     color,
     description: description || '',
-    createdAt: Timestamp.now(),
-    updatedAt: Timestamp.now()
+    createdAt: now,
+    updatedAt: now
   })
   return docRef.id
 }
@@ -369,14 +363,15 @@ export const createMessageTemplate = async (
   const variables = extractVariables(content)
 
   const docRef = doc(collection(db, 'crm_message_templates'))
+  const now = Timestamp.now()
   await setDoc(docRef, {
     shopId,
     name,
     category: category || 'General',
     content,
     variables,
-    createdAt: Timestamp.now(),
-    updatedAt: Timestamp.now()
+    createdAt: now,
+    updatedAt: now
   })
   return docRef.id
 }
@@ -425,14 +420,15 @@ export const createAutoTagRule = async (
   description?: string
 ): Promise<string> => {
   const docRef = doc(collection(db, 'crm_auto_tag_rules'))
+  const now = Timestamp.now()
   await setDoc(docRef, {
     shopId,
     pattern,
     tags,
     description: description || '',
     isActive: true,
-    createdAt: Timestamp.now(),
-    updatedAt: Timestamp.now()
+    createdAt: now,
+    updatedAt: now
   })
   return docRef.id
 }
@@ -159,6 +159,43 @@ class IndexedDBService {
     }
   }
 
+  // Writes all items in a single readwrite transaction instead of one per item
+  async setMany<T>(storeName: string, items: { id: string; data: T }[], synced: boolean = false): Promise<void> {
+    if (items.length === 0) return
+
+    if (!this.db) {
+      await this.init()
+    }
+
+    if (!this.db) {
+      throw new Error('IndexedDB not initialized')
+    }
+
+    const transaction = this.db.transaction([storeName], 'readwrite')
+    const store = transaction.objectStore(storeName)
+    const timestamp = Date.now()
+
+    return new Promise((resolve, reject) => {
+      transaction.oncomplete = () => resolve()
+      transaction.onerror = () => {
+        console.error(`Error bulk setting items in ${storeName}:`, transaction.error)
+        reject(transaction.error)
+      }
+      transaction.onabort = () => reject(transaction.error)
+
+      for (const { id, data } of items) {
+        const cacheItem: CacheItem<T> = {
+          id,
+          data,
+          timestamp,
+          version: 1,
+          synced
+        }
+        store.put(cacheItem)
+      }
+    })
+  }
+
   async delete(storeName: string, id: string): Promise<void> {
     try {
       const store = await this.getStore(storeName, 'readwrite')
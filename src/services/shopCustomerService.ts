@@ -2,6 +2,8 @@ import { collection, query, where, getDocs, addDoc, doc, getDoc, deleteDoc } fro
 import { Firestore } from 'firebase/firestore'
 import { syncContact } from './crmSyncService'
 import { applyAutoTagRules } from './crmService'
+import { shopLinkUtils } from '../utils/shopLinks'
+import { setBounded } from '../utils/boundedMap'
 
 export interface ShopAccessResult {
   success: boolean
@@ -11,13 +13,58 @@ export interface ShopAccessResult {
   error?: string
 }
 
-export const shopCustomerService = {
-  async parseStartParam(startParam: string): Promise<{ shopId: string; productId: string | null }> {
-    const parts = startParam.split('_')
-    return {
-      shopId: parts[0],
-      productId: parts.length > 1 ? parts.slice(1).join('_') : null
+const OWNERSHIP_TTL_MS = 5 * 60 * 1000
+const OWNERSHIP_CACHE_MAX_ENTRIES = 10000
+
+// Map keeps insertion order, so deleting and re-inserting a key on every hit
+// turns the first key into the least recently used one.
+const ownershipCache = new Map<string, { isOwner: boolean; expiresAt: number }>()
+
+const ownershipCacheKey = (shopId: string, telegramId: number) => `${shopId}:${telegramId}`
+
+// A Telegram user's document ID never changes once created, so lookups can be
+// kept for the lifetime of the page. Misses are not cached.
+const USER_ID_CACHE_MAX_ENTRIES = 10000
+const userIdCache = new Map<number, string>()
+
+const cacheUserId = (telegramId: number, userId: string) =>
+  setBounded(userIdCache, telegramId, userId, USER_ID_CACHE_MAX_ENTRIES)
+
+/**
+ * Resolve a Telegram user's document ID, returning null only when no user exists.
+ * Query failures are thrown so callers can tell them apart from "not found".
+ */
+async function lookupUserIdByTelegramId(db: Firestore, telegramId: number): Promise<string | null> {
+  const cachedUserId = userIdCache.get(telegramId)
+  if (cachedUserId) {
+    return cachedUserId
+  }
+
+  const usersRef = collection(db, 'users')
+  const userQuery = query(
+    usersRef,
+    where('telegramId', '==', telegramId)
+  )
+  const snapshot = await getDocs(userQuery)
+
+  if (snapshot.empty) {
+    const altQuery = query(usersRef, where('telegram_id', '==', telegramId))
+    const altSnapshot = await getDocs(altQuery)
+
+    if (altSnapshot.empty) {
+      return null
     }
+    cacheUserId(telegramId, altSnapshot.docs[0].id)
+    return altSnapshot.docs[0].id
+  }
+
+  cacheUserId(telegramId, snapshot.docs[0].id)
+  return snapshot.docs[0].id
+}
+
+export const shopCustomerService = {
+  parseStartParam(startParam: string): { shopId: string; productId: string | null } {
+    return shopLinkUtils.parseStartParam(startParam)
   },
 
   async checkIfCustomerExists(
@@ -49,13 +96,14 @@ export const shopCustomerService = {
   ): Promise<boolean> {
     try {
       const shopCustomersRef = collection(db, 'shop_customers')
+      const now = new Date()
       await addDoc(shopCustomersRef, {
         customerId,
         telegramId,
         shopId,
         role,
-        createdAt: new Date(),
-        updatedAt: new Date()
+        createdAt: now,
+        updatedAt: now
       })
       return true
     } catch (error) {
@@ -66,24 +114,7 @@ export const shopCustomerService = {
 
   async getUserIdByTelegramId(db: Firestore, telegramId: number): Promise<string | null> {
     try {
-      const usersRef = collection(db, 'users')
-      const userQuery = query(
-        usersRef,
-        where('telegramId', '==', telegramId)
-      )
-      const snapshot = await getDocs(userQuery)
-
-      if (snapshot.empty) {
-        const altQuery = query(usersRef, where('telegram_id', '==', telegramId))
-        const altSnapshot = await getDocs(altQuery)
-
-        if (altSnapshot.empty) {
-          return null
-        }
-        return altSnapshot.docs[0].id
-      }
-
-      return snapshot.docs[0].id
+      return await lookupUserIdByTelegramId(db, telegramId)
     } catch (error) {
       console.error('Error getting user ID:', error)
       return null
@@ -114,18 +145,20 @@ export const shopCustomerService = {
       }
 
       const usersRef = collection(db, 'users')
+      const now = new Date()
       const newUserData = {
         displayName,
         telegramId,
         telegram_id: telegramId,
         role: 'customer',
         profileCompleted: false,
-        createdAt: new Date(),
-        updatedAt: new Date()
+        createdAt: now,
+        updatedAt: now
       }
 
       const userDocRef = await addDoc(usersRef, newUserData)
       console.log('Created new user:', userDocRef.id)
+      cacheUserId(telegramId, userDocRef.id)
       return userDocRef.id
     } catch (error) {
       console.error('Error creating user:', error)
@@ -140,7 +173,7 @@ export const shopCustomerService = {
     displayName?: string
   ): Promise<ShopAccessResult> {
     try {
-      const { shopId, productId } = await this.parseStartParam(startParam)
+      const { shopId, productId } = this.parseStartParam(startParam)
 
       const shopExists = await this.verifyShopExists(db, shopId)
       if (!shopExists) {
@@ -223,6 +256,64 @@ export const shopCustomerService = {
     }
   },
 
+  /**
+   * Check whether a Telegram user owns a shop.
+   * Results are cached for a few minutes since shop ownership rarely changes.
+   * Lookup failures are thrown rather than reported as "not owner", and are never cached.
+   * @param ownerId - The shop's ownerId when the caller already has the shop doc; it is
+   * compared directly, bypassing the ownership cache so a fresh read is never overridden
+   */
+  async isShopOwner(
+    db: Firestore,
+    shopId: string,
+    telegramId: number,
+    ownerId?: string
+  ): Promise<boolean> {
+    if (ownerId !== undefined) {
+      return !!ownerId && await lookupUserIdByTelegramId(db, telegramId) === ownerId
+    }
+
+    const key = ownershipCacheKey(shopId, telegramId)
+    const cached = ownershipCache.get(key)
+
+    if (cached) {
+      ownershipCache.delete(key)
+      if (cached.expiresAt > Date.now()) {
+        ownershipCache.set(key, cached)
+        return cached.isOwner
+      }
+    }
+
+    // The shop's owner and the caller's user id are independent lookups, so
+    // resolve them together rather than one round-trip after the other.
+    // Either lookup failing rejects here, before anything is cached.
+    const [shopOwnerId, userId] = await Promise.all([
+      getDoc(doc(db, 'shops', shopId)).then(shopDoc =>
+        shopDoc.exists() ? shopDoc.data().ownerId as string | undefined : undefined
+      ),
+      lookupUserIdByTelegramId(db, telegramId)
+    ])
+
+    const isOwner = !!shopOwnerId && userId === shopOwnerId
+
+    setBounded(ownershipCache, key, { isOwner, expiresAt: Date.now() + OWNERSHIP_TTL_MS }, OWNERSHIP_CACHE_MAX_ENTRIES)
+
+    return isOwner
+  },
+
+  /**
+   * Drop cached ownership results for a shop after its owner may have changed
+   * @param shopId - The shop ID
+   */
+  invalidateShopOwnership(shopId: string): void {
+    const prefix = `${shopId}:`
+    for (const key of Array.from(ownershipCache.keys())) {
+      if (key.startsWith(prefix)) {
+        ownershipCache.delete(key)
+      }
+    }
+  },
+
   async removeCustomerFromShop(
     db: Firestore,
     shopId: string,
@@ -244,61 +335,10 @@ export const shopCustomerService = {
 
       const shopData = shopDoc.data()
       console.log('[removeCustomerFromShop] Shop data:', { ownerId: shopData.ownerId })
-      if (shopData.ownerId) {
-        const ownerUsersRef = collection(db, 'users')
-
-        // Check with telegramId field
-        const ownerQuery = query(
-          ownerUsersRef,
-          where('telegramId', '==', telegramId)
-        )
-        const ownerSnapshot = await getDocs(ownerQuery)
-
-        console.log('[removeCustomerFromShop] Owner query results:', {
-          found: !ownerSnapshot.empty,
-          count: ownerSnapshot.docs.length
-        })
-
-        if (!ownerSnapshot.empty) {
-          const ownerDoc = ownerSnapshot.docs[0]
-          console.log('[removeCustomerFromShop] Found owner by telegramId:', {
-            ownerDocId: ownerDoc.id,
-            shopOwnerId: shopData.ownerId,
-            isOwner: ownerDoc.id === shopData.ownerId
-          })
-          if (ownerDoc.id === shopData.ownerId) {
-            return {
-              success: false,
-              error: 'Cannot remove shop owner from their own shop'
-            }
-          }
-        } else {
-          // Try with telegram_id field as fallback
-          const altOwnerQuery = query(
-            ownerUsersRef,
-            where('telegram_id', '==', telegramId)
-          )
-          const altOwnerSnapshot = await getDocs(altOwnerQuery)
-
-          console.log('[removeCustomerFromShop] Alt owner query results:', {
-            found: !altOwnerSnapshot.empty,
-            count: altOwnerSnapshot.docs.length
-          })
-
-          if (!altOwnerSnapshot.empty) {
-            const ownerDoc = altOwnerSnapshot.docs[0]
-            console.log('[removeCustomerFromShop] Found owner by telegram_id:', {
-              ownerDocId: ownerDoc.id,
-              shopOwnerId: shopData.ownerId,
-              isOwner: ownerDoc.id === shopData.ownerId
-            })
-            if (ownerDoc.id === shopData.ownerId) {
-              return {
-                success: false,
-                error: 'Cannot remove shop owner from their own shop'
-              }
-            }
-          }
+      if (shopData.ownerId && await this.isShopOwner(db, shopId, telegramId, shopData.ownerId)) {
+        return {
+          success: false,
+          error: 'Cannot remove shop owner from their own shop'
         }
       }
 
@@ -1,3 +1,5 @@
+import { setBounded } from '../utils/boundedMap'
+
 export interface TelegramBotConfig {
   botToken: string
   chatId: string
@@ -10,6 +12,25 @@ export interface PromotionMessage {
   replyMarkup?: any
 }
 
+const DEFAULT_PARSE_MODE: NonNullable<PromotionMessage['parseMode']> = 'HTML'
+
+// Bounds for the localStorage-backed promotion schedule, which otherwise keeps
+// every promotion ever scheduled
+const SCHEDULED_PROMOTIONS_MAX_ENTRIES = 100
+const SCHEDULED_PROMOTIONS_RETENTION_MS = 7 * 24 * 60 * 60 * 1000
+
+function pruneScheduledPromotions(promotions: any[]): any[] {
+  const cutoff = Date.now() - SCHEDULED_PROMOTIONS_RETENTION_MS
+  return promotions
+    .filter(p => new Date(p.scheduledDate).getTime() > cutoff)
+    .slice(-SCHEDULED_PROMOTIONS_MAX_ENTRIES)
+}
+
+// A chat's numeric id doesn't change, so a username only needs resolving via
+// getChat once per bot instead of on every promotion send
+const RESOLVED_CHAT_IDS_MAX_ENTRIES = 1000
+const resolvedChatIds = new Map<string, string>()
+
 /**
  * Calls the Telegram Bot API via the Firebase Cloud Function proxy.
  * The proxy is needed because browsers cannot call api.telegram.org directly (CORS).
@@ -47,6 +68,135 @@ async function callTelegramApi(botToken: string, method: string, params: any) {
   return result
 }
 
+// Telegram allows a bot roughly 30 messages per second overall, about one per
+// second to a single private chat and 20 per minute to a group
+const GLOBAL_SENDS_PER_SECOND = 30
+const PRIVATE_CHAT_SEND_INTERVAL_MS = 1000
+const GROUP_CHAT_SEND_INTERVAL_MS = 3000
+const MAX_RATE_LIMIT_RETRIES = 3
+
+const recentSendTimesByBot = new Map<string, number[]>()
+const nextChatSendAt = new Map<string, number>()
+// Set from a 429's retry_after; every send for that bot waits it out, not just the
+// chat that was refused
+const botPausedUntil = new Map<string, number>()
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms))
+
+// Both limiter maps are kept in last-use order (delete before set), so entries whose
+// window has passed collect at the front; each write drops them up to the first live
+// entry. An expired entry carries no information, so dropping it never changes pacing.
+function setChatSendAt(chatKey: string, sendAt: number) {
+  nextChatSendAt.delete(chatKey)
+  nextChatSendAt.set(chatKey, sendAt)
+
+  const now = Date.now()
+  for (const [key, slot] of nextChatSendAt) {
+    if (slot > now) break
+    nextChatSendAt.delete(key)
+  }
+}
+
+function touchBotSendTimes(botToken: string, recentSends: number[]) {
+  recentSendTimesByBot.delete(botToken)
+  recentSendTimesByBot.set(botToken, recentSends)
+
+  const now = Date.now()
+  for (const [token, sends] of recentSendTimesByBot) {
+    if (sends.length > 0 && now - sends[sends.length - 1] < 1000) break
+    recentSendTimesByBot.delete(token)
+  }
+}
+
+async function waitForSendSlot(botToken: string, chatId: string | number) {
+  // Honour a bot-wide flood pause first; it may be extended by another 429 while we sleep
+  for (;;) {
+    const pausedUntil = botPausedUntil.get(botToken)
+    if (pausedUntil === undefined) break
+    if (pausedUntil <= Date.now()) {
+      botPausedUntil.delete(botToken)
+      break
+    }
+    await sleep(pausedUntil - Date.now())
+  }
+
+  // Reserve this chat's next slot up front so concurrent sends to one chat queue behind each other
+  const chatKey = `${botToken}:${chatId}`
+  const chatInterval = String(chatId).startsWith('-') ? GROUP_CHAT_SEND_INTERVAL_MS : PRIVATE_CHAT_SEND_INTERVAL_MS
+  const chatSlot = Math.max(Date.now(), nextChatSendAt.get(chatKey) || 0)
+  setChatSendAt(chatKey, chatSlot + chatInterval)
+  if (chatSlot > Date.now()) {
+    await sleep(chatSlot - Date.now())
+  }
+
+  // Then wait for room in the bot-wide one-second window
+  for (;;) {
+    // Re-read each round: an idle bot's entry may have been pruned while we slept
+    const recentSends = recentSendTimesByBot.get(botToken) || []
+    const now = Date.now()
+    while (recentSends.length > 0 && now - recentSends[0] >= 1000) {
+      recentSends.shift()
+    }
+    if (recentSends.length < GLOBAL_SENDS_PER_SECOND) {
+      recentSends.push(now)
+      touchBotSendTimes(botToken, recentSends)
+      return
+    }
+    await sleep(1000 - (now - recentSends[0]))
+  }
+}
+
+/**
+ * Sends a message-producing Bot API call through the outbound rate limiter.
+ * A 429 pauses every send for the bot until retry_after has passed, then retries.
+ */
+async function callTelegramSendApi(botToken: string, method: string, params: any) {
+  for (let attempt = 0; ; attempt++) {
+    await waitForSendSlot(botToken, params.chat_id)
+    const result = await callTelegramApi(botToken, method, params)
+
+    const retryAfter = result.parameters?.retry_after
+    if (result.ok || result.error_code !== 429 || !retryAfter || attempt >= MAX_RATE_LIMIT_RETRIES) {
+      return result
+    }
+
+    console.warn(`Telegram rate limit hit for ${method}, pausing all sends for ${retryAfter}s`)
+    botPausedUntil.set(botToken, Math.max(botPausedUntil.get(botToken) || 0, Date.now() + retryAfter * 1000))
+  }
+}
+
+/**
+ * Sends a prepared payload, retrying once against the new chat ID when a group
+ * has been upgraded to a supergroup. The payload is built once and only its
+ * chat_id is swapped for the retry.
+ */
+async function sendWithMigrationRetry(botToken: string, method: string, payload: any, description: string) {
+  const result = await callTelegramSendApi(botToken, method, payload)
+  if (result.ok) {
+    return true
+  }
+
+  console.error('Telegram API error:', result)
+
+  // Handle chat migration (group upgraded to supergroup)
+  if (result.error_code === 400 && result.parameters?.migrate_to_chat_id) {
+    const newChatId = result.parameters.migrate_to_chat_id
+    console.log(`Chat migrated from ${payload.chat_id} to ${newChatId}, retrying...`)
+
+    const retryResult = await callTelegramSendApi(botToken, method, { ...payload, chat_id: newChatId })
+
+    if (!retryResult.ok) {
+      throw new Error(retryResult.description || `Failed to send ${description} after migration`)
+    }
+
+    console.log(`Successfully sent to migrated chat: ${newChatId}`)
+    console.warn(`IMPORTANT: Update your department chat ID from ${payload.chat_id} to ${newChatId}`)
+    return true
+  }
+
+  throw new Error(result.description || `Failed to send ${description}`)
+}
+
 export const telegramService = {
   async sendPromotionMessage(
     config: TelegramBotConfig,
@@ -65,19 +215,29 @@ export const telegramService = {
 
       console.log('Sending promotion message to:', chatId)
 
+      const parseMode = message.parseMode || DEFAULT_PARSE_MODE
+
       // Convert username to chat ID if needed
       let finalChatId = chatId
       if (chatId.startsWith('@') || !/^-?\d+$/.test(chatId)) {
-        console.log('Converting username to chat ID:', chatId)
-        const telegramApi = new (await import('./telegramApi')).TelegramApiService(botToken)
-        const convertedId = await telegramApi.getUserIdByUsername(chatId)
-        if (convertedId) {
-          finalChatId = convertedId.toString()
-          console.log('Converted to chat ID:', finalChatId)
+        const cacheKey = `${botToken}:${chatId.replace('@', '').toLowerCase()}`
+        const cachedChatId = resolvedChatIds.get(cacheKey)
+
+        if (cachedChatId) {
+          finalChatId = cachedChatId
         } else {
-          const error = `Could not convert username to chat ID: ${chatId}. Make sure the bot has access to this chat.`
-          console.error(error)
-          throw new Error(error)
+          console.log('Converting username to chat ID:', chatId)
+          const telegramApi = new (await import('./telegramApi')).TelegramApiService(botToken)
+          const convertedId = await telegramApi.getUserIdByUsername(chatId)
+          if (convertedId) {
+            finalChatId = convertedId.toString()
+            console.log('Converted to chat ID:', finalChatId)
+            setBounded(resolvedChatIds, cacheKey, finalChatId, RESOLVED_CHAT_IDS_MAX_ENTRIES)
+          } else {
+            const error = `Could not convert username to chat ID: ${chatId}. Make sure the bot has access to this chat.`
+            console.error(error)
+            throw new Error(error)
+          }
         }
       }
 
@@ -88,111 +248,31 @@ export const telegramService = {
             type: 'photo',
             media: url,
             caption: index === 0 ? message.text : undefined,
-            parse_mode: message.parseMode || 'HTML'
+            parse_mode: parseMode
           }))
 
-          const result = await callTelegramApi(botToken, 'sendMediaGroup', {
+          return await sendWithMigrationRetry(botToken, 'sendMediaGroup', {
             chat_id: finalChatId,
             media: media
-          })
-          if (!result.ok) {
-            console.error('Telegram API error:', result)
-
-            // Handle chat migration (group upgraded to supergroup)
-            if (result.error_code === 400 && result.parameters?.migrate_to_chat_id) {
-              const newChatId = result.parameters.migrate_to_chat_id
-              console.log(`Chat migrated from ${finalChatId} to ${newChatId}, retrying...`)
-
-              const retryResult = await callTelegramApi(botToken, 'sendMediaGroup', {
-                chat_id: newChatId,
-                media: media
-              })
-
-              if (!retryResult.ok) {
-                throw new Error(retryResult.description || 'Failed to send media group after migration')
-              }
-
-              console.log(`Successfully sent to migrated chat: ${newChatId}`)
-              console.warn(`IMPORTANT: Update your department chat ID from ${finalChatId} to ${newChatId}`)
-              return true
-            }
-
-            throw new Error(result.description || 'Failed to send media group')
-          }
-          return true
+          }, 'media group')
         } else {
           // Send single photo with caption
-          const result = await callTelegramApi(botToken, 'sendPhoto', {
+          return await sendWithMigrationRetry(botToken, 'sendPhoto', {
             chat_id: finalChatId,
             photo: message.images[0],
             caption: message.text,
-            parse_mode: message.parseMode || 'HTML',
+            parse_mode: parseMode,
             reply_markup: message.replyMarkup
-          })
-          if (!result.ok) {
-            console.error('Telegram API error:', result)
-
-            // Handle chat migration (group upgraded to supergroup)
-            if (result.error_code === 400 && result.parameters?.migrate_to_chat_id) {
-              const newChatId = result.parameters.migrate_to_chat_id
-              console.log(`Chat migrated from ${finalChatId} to ${newChatId}, retrying...`)
-
-              const retryResult = await callTelegramApi(botToken, 'sendPhoto', {
-                chat_id: newChatId,
-                photo: message.images[0],
-                caption: message.text,
-                parse_mode: message.parseMode || 'HTML',
-                reply_markup: message.replyMarkup
-              })
-
-              if (!retryResult.ok) {
-                throw new Error(retryResult.description || 'Failed to send photo after migration')
-              }
-
-              console.log(`Successfully sent to migrated chat: ${newChatId}`)
-              console.warn(`IMPORTANT: Update your department chat ID from ${finalChatId} to ${newChatId}`)
-              return true
-            }
-
-            throw new Error(result.description || 'Failed to send photo')
-          }
-          return true
+          }, 'photo')
         }
       } else {
         // Send text message only
-        const result = await callTelegramApi(botToken, 'sendMessage', {
+        return await sendWithMigrationRetry(botToken, 'sendMessage', {
           chat_id: finalChatId,
           text: message.text,
-          parse_mode: message.parseMode || 'HTML',
+          parse_mode: parseMode,
           reply_markup: message.replyMarkup
-        })
-        if (!result.ok) {
-          console.error('Telegram API error:', result)
-
-          // Handle chat migration (group upgraded to supergroup)
-          if (result.error_code === 400 && result.parameters?.migrate_to_chat_id) {
-            const newChatId = result.parameters.migrate_to_chat_id
-            console.log(`Chat migrated from ${finalChatId} to ${newChatId}, retrying...`)
-
-            const retryResult = await callTelegramApi(botToken, 'sendMessage', {
-              chat_id: newChatId,
-              text: message.text,
-              parse_mode: message.parseMode || 'HTML',
-              reply_markup: message.replyMarkup
-            })
-
-            if (!retryResult.ok) {
-              throw new Error(retryResult.description || 'Failed to send message after migration')
-            }
-
-            console.log(`Successfully sent to migrated chat: ${newChatId}`)
-            console.warn(`IMPORTANT: Update your department chat ID from ${finalChatId} to ${newChatId}`)
-            return true
-          }
-
-          throw new Error(result.description || 'Failed to send message')
-        }
-        return true
+        }, 'message')
       }
     } catch (error) {
       console.error('Error sending Telegram message:', error)
@@ -220,7 +300,7 @@ export const telegramService = {
     }
 
     scheduledMessages.push(scheduledPromotion)
-    localStorage.setItem('scheduledPromotions', JSON.stringify(scheduledMessages))
+    localStorage.setItem('scheduledPromotions', JSON.stringify(pruneScheduledPromotions(scheduledMessages)))
 
     // Set timeout for immediate scheduling (for demo purposes)
     const timeUntilSend = scheduledDate.getTime() - Date.now()
@@ -237,7 +317,7 @@ export const telegramService = {
           )
           if (messageIndex !== -1) {
             updatedMessages[messageIndex].status = 'sent'
-            localStorage.setItem('scheduledPromotions', JSON.stringify(updatedMessages))
+            localStorage.setItem('scheduledPromotions', JSON.stringify(pruneScheduledPromotions(updatedMessages)))
           }
         }
       }, timeUntilSend)
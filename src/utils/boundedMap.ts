@@ -0,0 +1,20 @@
+/**
+ * Set a key on a Map used as a size-capped cache, evicting the oldest entry
+ * when the cap is exceeded. Map keeps insertion order, so the key is re-inserted
+ * to count as the newest and the first key is always the one to evict.
+ * @param map - The cache map
+ * @param key - Key to store
+ * @param value - Value to store
+ * @param maxEntries - Maximum number of entries to keep
+ */
+export const setBounded = <K, V>(map: Map<K, V>, key: K, value: V, maxEntries: number): void => {
+  map.delete(key)
+  map.set(key, value)
+
+  if (map.size > maxEntries) {
+    const oldestKey = map.keys().next().value
+    if (oldestKey !== undefined) {
+      map.delete(oldestKey)
+    }
+  }
+}
@@ -0,0 +1,38 @@
+import {
+  Firestore,
+  DocumentData,
+  QueryDocumentSnapshot,
+  collection,
+  getDocs,
+  query,
+  where
+} from 'firebase/firestore'
+
+// Firestore limits how many values an 'in' filter may hold
+const IN_QUERY_CHUNK_SIZE = 10
+
+/**
+ * Fetch documents by ID using batched 'in' queries run in parallel,
+ * instead of one getDoc round-trip per document.
+ * @param db - Firestore instance
+ * @param collectionName - Collection to read from
+ * @param ids - Document IDs; duplicates and empty values are ignored
+ * @returns The documents that exist, in no particular order
+ */
+export const getDocsByIds = async (
+  db: Firestore,
+  collectionName: string,
+  ids: string[]
+): Promise<QueryDocumentSnapshot<DocumentData>[]> => {
+  const uniqueIds = Array.from(new Set(ids.filter(Boolean)))
+  const collectionRef = collection(db, collectionName)
+
+  const chunkQueries = []
+  for (let i = 0; i < uniqueIds.length; i += IN_QUERY_CHUNK_SIZE) {
+    const chunk = uniqueIds.slice(i, i + IN_QUERY_CHUNK_SIZE)
+    chunkQueries.push(getDocs(query(collectionRef, where('__name__', 'in', chunk))))
+  }
+
+  const snapshots = await Promise.all(chunkQueries)
+  return snapshots.flatMap(snapshot => snapshot.docs)
+}
@@ -9,6 +9,27 @@ export interface ShopLinkOptions {
   productId?: string
 }
 
+export interface PromotionMessageOptions {
+  promotionTitle: string
+  customMessage?: string
+  discountPercentage: number
+  validUntil?: Date | string
+  tags: string[]
+  botUsername?: string
+}
+
+/**
+ * Escape text for Telegram's HTML parse mode
+ * @param text - Raw text, e.g. a product name or description
+ * @returns Text safe to embed in an HTML-formatted message
+ */
+const escapeHtml = (text: string): string =>
+  text
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;')
+
 export const shopLinkUtils = {
   /**
    * Generate a shop-specific Mini App link
@@ -35,42 +56,59 @@ export const shopLinkUtils = {
     const link = this.generateShopLink(shop.id, options)
     const customMessage = options.customMessage || ''
     
-    let message = `🛍️ **${shop.name}**\n\n`
+    const parts = [`🛍️ **${shop.name}**\n\n`]
     
     if (options.includeDescription && shop.description) {
-      message += `${shop.description}\n\n`
+      parts.push(`${shop.description}\n\n`)
     }
     
     if (customMessage) {
-      message += `${customMessage}\n\n`
+      parts.push(`${customMessage}\n\n`)
     }
     
     // Add business info if available
     if (shop.businessInfo) {
       if (shop.businessInfo.address) {
-        message += `📍 ${shop.businessInfo.address}\n`
+        parts.push(`📍 ${shop.businessInfo.address}\n`)
       }
       if (shop.businessInfo.phone) {
-        message += `📞 ${shop.businessInfo.phone}\n`
+        parts.push(`📞 ${shop.businessInfo.phone}\n`)
       }
       if (shop.businessInfo.website) {
-        message += `🌐 ${shop.businessInfo.website}\n`
+        parts.push(`🌐 ${shop.businessInfo.website}\n`)
       }
-      message += '\n'
+      parts.push('\n')
     }
     
     // Add operating hours if available
     if (shop.settings?.businessHours) {
       const { open, close, days } = shop.settings.businessHours
       if (days && days.length > 0) {
-        message += `🕒 Open: ${open} - ${close}\n`
-        message += `📅 Days: ${days.map(d => d.charAt(0).toUpperCase() + d.slice(1)).join(', ')}\n\n`
+        parts.push(`🕒 Open: ${open} - ${close}\n`)
+        parts.push(`📅 Days: ${days.map(d => d.charAt(0).toUpperCase() + d.slice(1)).join(', ')}\n\n`)
       }
     }
     
-    message += `🚀 Browse our catalog: ${link}`
+    parts.push(`🚀 Browse our catalog: ${link}`)
     
-    return message
+    return parts.join('')
+  },
+
+  /**
+   * Split a start parameter into shop ID and optional product ID.
+   * Only the first underscore separates them, so product IDs may contain underscores.
+   * @param startParam - The raw startapp/start parameter
+   * @returns Object with shopId and optional productId
+   */
+  parseStartParam(startParam: string): { shopId: string; productId: string | null } {
+    const separatorIdx = startParam.indexOf('_')
+    if (separatorIdx === -1) {
+      return { shopId: startParam, productId: null }
+    }
+    return {
+      shopId: startParam.slice(0, separatorIdx),
+      productId: startParam.slice(separatorIdx + 1) || null
+    }
   },
 
   /**
@@ -87,11 +125,7 @@ export const shopLinkUtils = {
         return { shopId: null, productId: null }
       }
 
-      const parts = startParam.split('_')
-      return {
-        shopId: parts[0],
-        productId: parts[1] || null
-      }
+      return this.parseStartParam(startParam)
     } catch (error) {
       console.error('Error parsing shop link:', error)
       return { shopId: null, productId: null }
@@ -167,26 +201,63 @@ export const shopLinkUtils = {
     const customMessage = options.customMessage || ''
     const title = customMessage || `🔥 🔥 Special Offer: ${product.name}`
 
-    let message = `${title}\n\n`
-    message += `🛍️ ${product.name}\n\n`
+    const parts = [`${title}\n\n`, `🛍️ ${product.name}\n\n`]
 
     if (product.description) {
       const shortDesc = product.description.length > 150
         ? `${product.description.substring(0, 150)}...`
         : product.description
-      message += `${shortDesc}\n\n`
+      parts.push(`${shortDesc}\n\n`)
     }
 
     const priceFormatted = product.price ? Number(product.price).toFixed(2) : '0.00'
-    message += `💰 Price: $${priceFormatted}\n`
+    parts.push(`💰 Price: $${priceFormatted}\n`)
 
     if (product.sku) {
-      message += `🏷️ SKU: ${product.sku}\n`
+      parts.push(`🏷️ SKU: ${product.sku}\n`)
     }
 
-    message += `\n🛒 Order Now! Don't miss this amazing deal!\n\n`
-    message += `#special #offer`
+    parts.push(`\n🛒 Order Now! Don't miss this amazing deal!\n\n`)
+    parts.push(`#special #offer`)
 
-    return message
+    return parts.join('')
+  },
+
+  /**
+   * Generate the HTML-formatted promotion message sent to Telegram chats
+   * @param product - The promoted product
+   * @param options - Promotion details
+   * @returns The message text for parse mode HTML, with all user content escaped
+   */
+  generatePromotionMessage(product: any, options: PromotionMessageOptions): string {
+    const { promotionTitle, customMessage, discountPercentage, validUntil, tags } = options
+    const productLink = this.generateShopLink(product.shopId, { productId: product.id, botUsername: options.botUsername })
+
+    const price = `$${product.price.toFixed(2)}`
+    const priceText = discountPercentage > 0
+      ? `<s>${price}</s> <b>$${(product.price * (1 - discountPercentage / 100)).toFixed(2)}</b>`
+      : `<b>${price}</b>`
+
+    const lines = [
+      `🔥 <b>${escapeHtml(promotionTitle)}</b>`,
+      ...(discountPercentage > 0 ? [`💥 <b>${discountPercentage}% OFF!</b>`] : []),
+      '',
+      `🛍️ <b>${escapeHtml(product.name)}</b>`,
+      '',
+      escapeHtml(customMessage || product.description || ''),
+      '',
+      `💰 <b>Price:</b> ${priceText}`,
+      ...(product.sku ? [`🏷️ <b>SKU:</b> ${escapeHtml(product.sku)}`] : []),
+      ...(validUntil ? [`⏰ <b>Valid until:</b> ${new Date(validUntil).toLocaleDateString()}`] : []),
+      '',
+      "🛒 <b>Order Now!</b> Don't miss this amazing deal!",
+      ...(tags.length > 0 ? ['', escapeHtml(tags.join(' '))] : []),
+      '',
+      `👉 <a href="${escapeHtml(productLink)}">View Product</a>`,
+      '',
+      '<i>🚀 Limited time offer - Order today!</i>'
+    ]
+
+    return lines.join('\n')
   }
-}
\ No newline at end of file
+}